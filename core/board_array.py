@@ -0,0 +1,214 @@
+# core/board_array.py
+
+from core.pattern import Pattern
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，只有数组后端需要
+    np = None
+
+
+class ArrayBoard:
+    """
+    数组后端的棋盘（结构化数组），用 NumPy 数组保存所有图案的
+    ID、层级、中心点、尺寸和消除状态，重叠、点选等查询以批量向量运算完成。
+    """
+
+    # 计算两两重叠时每批处理的图案数量，控制临时矩阵的内存占用
+    BLOCK_SIZE = 512
+
+    def __init__(self, ids, layers, centers, sizes):
+        """
+        初始化数组棋盘。
+
+        :param ids: 序列，图案类型ID
+        :param layers: 序列，图案所在层级
+        :param centers: 序列，图案中心点 (x, y)
+        :param sizes: 序列，图案尺寸 (width, height)
+        """
+        if np is None:
+            raise ImportError("数组棋盘后端需要安装 numpy。")
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.layers = np.asarray(layers, dtype=np.int32)
+        self.centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        self.sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 2)
+        self.cleared = np.zeros(len(self.ids), dtype=bool)
+        self.cover_counts = np.zeros(len(self.ids), dtype=np.int32)
+        self.coverage_graph = None  # ArrayCoverageGraph，由 GameLogic 构建
+
+    @classmethod
+    def from_patterns(cls, patterns):
+        """
+        根据 Pattern 对象列表构建数组棋盘。
+
+        :param patterns: list，Pattern 对象列表
+        :return: ArrayBoard
+        """
+        board = cls(
+            [p.id for p in patterns],
+            [p.layer for p in patterns],
+            [p.position for p in patterns],
+            [p.size for p in patterns],
+        )
+        board.cleared[:] = [p.is_cleared for p in patterns]
+        return board
+
+    def __len__(self):
+        return len(self.ids)
+
+    def views(self):
+        """
+        为每个图案创建轻量的 Pattern 视图，视图的属性直接读写数组。
+
+        :return: list，PatternView 对象列表
+        """
+        return [PatternView(self, index) for index in range(len(self))]
+
+    def bounds(self):
+        """
+        计算所有图案的矩形边界。
+
+        :return: (left, top, right, bottom)，四个 numpy 数组
+        """
+        half = self.sizes / 2
+        low = self.centers - half
+        high = self.centers + half
+        return low[:, 0], low[:, 1], high[:, 0], high[:, 1]
+
+    def coverage_pairs(self):
+        """
+        分批计算所有遮挡关系（上层图案与下层图案重叠）。
+
+        :return: (below, above)，两个下标数组，above[k] 覆盖 below[k]
+        """
+        left, top, right, bottom = self.bounds()
+        below_parts = []
+        above_parts = []
+        for start in range(0, len(self), self.BLOCK_SIZE):
+            end = min(start + self.BLOCK_SIZE, len(self))
+            overlap = (
+                (right[start:end, None] > left[None, :])
+                & (right[None, :] > left[start:end, None])
+                & (bottom[start:end, None] > top[None, :])
+                & (bottom[None, :] > top[start:end, None])
+                & (self.layers[None, :] > self.layers[start:end, None])
+            )
+            rows, cols = np.nonzero(overlap)
+            below_parts.append(rows + start)
+            above_parts.append(cols)
+        if not below_parts:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(below_parts), np.concatenate(above_parts)
+
+    def compute_cover_counts(self):
+        """
+        以向量运算重新计算每个图案被多少未消除图案覆盖。
+
+        :return: numpy 数组，每个图案的覆盖数量
+        """
+        below, above = self.coverage_pairs()
+        active = ~self.cleared[above]
+        return np.bincount(below[active], minlength=len(self)).astype(np.int32)
+
+    def indices_at_point(self, point):
+        """
+        查询包含指定点的所有图案下标。
+
+        :param point: (x, y) 坐标
+        :return: numpy 数组，图案下标
+        """
+        px, py = point
+        left, top, right, bottom = self.bounds()
+        mask = (left <= px) & (px <= right) & (top <= py) & (py <= bottom)
+        return np.nonzero(mask)[0]
+
+    def topmost_uncovered_at(self, point):
+        """
+        查询指定点上画在最上面、未消除且未被覆盖的图案。
+        与绘制顺序一致：层级最高，层级相同时取下标最大的图案。
+
+        :param point: (x, y) 坐标
+        :return: int，图案下标；没有时返回 -1
+        """
+        candidates = self.indices_at_point(point)
+        candidates = candidates[~self.cleared[candidates] & (self.cover_counts[candidates] == 0)]
+        if len(candidates) == 0:
+            return -1
+        # np.lexsort 以最后一个键为主键：按 (层级, 下标) 升序，取最后一个
+        order = np.lexsort((candidates, self.layers[candidates]))
+        return int(candidates[order[-1]])
+
+
+class PatternView(Pattern):
+    """
+    数组棋盘中单个图案的轻量视图，接口与 Pattern 相同，数据存放在 ArrayBoard 中。
+    """
+
+    def __init__(self, board, index):
+        """
+        初始化图案视图。
+
+        :param board: ArrayBoard，所属的数组棋盘
+        :param index: int，图案在棋盘中的下标
+        """
+        self.board = board
+        self.index = index
+
+    @property
+    def id(self):
+        return int(self.board.ids[self.index])
+
+    @id.setter
+    def id(self, value):
+        self.board.ids[self.index] = value
+
+    @property
+    def layer(self):
+        return int(self.board.layers[self.index])
+
+    @layer.setter
+    def layer(self, value):
+        self.board.layers[self.index] = value
+
+    @property
+    def position(self):
+        x, y = self.board.centers[self.index]
+        return (float(x), float(y))
+
+    @position.setter
+    def position(self, value):
+        self.board.centers[self.index] = value
+
+    @property
+    def size(self):
+        width, height = self.board.sizes[self.index]
+        return (int(width), int(height))
+
+    @size.setter
+    def size(self, value):
+        self.board.sizes[self.index] = value
+
+    @property
+    def _is_cleared(self):
+        return bool(self.board.cleared[self.index])
+
+    @_is_cleared.setter
+    def _is_cleared(self, value):
+        self.board.cleared[self.index] = value
+
+    @property
+    def coverage_graph(self):
+        return self.board.coverage_graph
+
+    @coverage_graph.setter
+    def coverage_graph(self, value):
+        self.board.coverage_graph = value
+
+    @property
+    def cover_count(self):
+        return int(self.board.cover_counts[self.index])
+
+    @cover_count.setter
+    def cover_count(self, value):
+        self.board.cover_counts[self.index] = value
@@ -0,0 +1,165 @@
+# core/board_generator.py
+
+import random
+
+from core.pattern import Pattern
+from core.spatial_index import SpatialGrid
+
+
+class SolvableBoardGenerator:
+    """
+    可解棋盘生成器，通过“倒放”构建棋盘：
+    先确定一个合法的消除顺序，再按相反顺序逐个摆放图案，
+    每个图案都放在所有已摆放且与之重叠的图案之上，因此按该顺序一定可以全部消除。
+    """
+
+    # 为每个图案寻找合适位置的最大尝试次数
+    PLACEMENT_ATTEMPTS = 8
+
+    def __init__(self, level_config, pattern_size, center, max_offset, rng=None):
+        """
+        初始化生成器。
+
+        :param level_config: dict，关卡配置参数
+        :param pattern_size: (width, height)，图案尺寸
+        :param center: (x, y)，摆放区域中心
+        :param max_offset: float，图案相对中心的最大偏移量
+        :param rng: random.Random，随机数生成器，默认使用全局 random 模块
+        """
+        self.level_config = level_config
+        self.pattern_size = pattern_size
+        self.center = center
+        self.max_offset = max_offset
+        self.rng = rng if rng is not None else random
+
+    def generate(self):
+        """
+        生成一个可解棋盘。
+
+        :return: (patterns, layers, solution)
+                 patterns 为按层级排序的 Pattern 列表，
+                 layers 为各层的图案列表，
+                 solution 为一个可以清空棋盘的图案下标顺序（见证解）
+        """
+        clear_order = self.generate_clear_order()
+        patterns = self.place_in_reverse(clear_order)
+
+        # 按层级排序后重新编号，保持 patterns 与 layers 的顺序一致
+        order = sorted(range(len(patterns)), key=lambda i: patterns[i].layer)
+        new_index = {}
+        sorted_patterns = []
+        for i in order:
+            pattern = patterns[i]
+            new_index[i] = len(sorted_patterns)
+            pattern.index = new_index[i]
+            sorted_patterns.append(pattern)
+
+        layers = [[] for _ in range(self.level_config['layer_count'])]
+        for pattern in sorted_patterns:
+            layers[pattern.layer].append(pattern)
+
+        solution = [new_index[i] for i in range(len(patterns))]
+        return sorted_patterns, layers, solution
+
+    def generate_clear_order(self):
+        """
+        生成一个合法的消除顺序（图案ID序列），保证过程中暂存区不会被填满。
+
+        :return: list，按消除顺序排列的图案ID
+        """
+        pattern_types = self.level_config['pattern_types']
+        total_patterns = self.level_config['total_patterns']
+        storage_limit = self.level_config['storage_limit']
+        match_size = self.level_config.get('match_size', 3)
+
+        # 与 GameLogic.generate_patterns 相同：总数补齐为消除数量的倍数，ID 依次循环
+        if total_patterns % match_size != 0:
+            total_patterns += match_size - (total_patterns % match_size)
+        remaining = {}
+        for i in range(total_patterns // match_size):
+            pattern_id = i % pattern_types
+            remaining[pattern_id] = remaining.get(pattern_id, 0) + 1
+
+        tray = {}       # 暂存区中未凑齐的ID -> 数量
+        tray_size = 0
+        order = []
+        while remaining or tray:
+            # 同一ID同时只有一组在暂存区中，否则会提前凑齐
+            new_ids = [pattern_id for pattern_id in remaining if pattern_id not in tray]
+            candidates = list(tray) + ([None] if new_ids else [])
+            options = [
+                pattern_id for pattern_id in candidates
+                if self._is_safe_step(tray, tray_size, pattern_id, match_size, storage_limit)
+            ]
+
+            choice = self.rng.choice(options)
+            if choice is None:
+                choice = self.rng.choice(new_ids)
+                remaining[choice] -= 1
+                if remaining[choice] == 0:
+                    del remaining[choice]
+                tray[choice] = 0
+            order.append(choice)
+            tray[choice] += 1
+            tray_size += 1
+            if tray[choice] == match_size:
+                del tray[choice]
+                tray_size -= match_size
+        return order
+
+    @staticmethod
+    def _is_safe_step(tray, tray_size, pattern_id, match_size, storage_limit):
+        """
+        判断放入一个图案后，暂存区是否仍能在不被填满的情况下凑齐下一组。
+
+        :param tray: dict，暂存区中未凑齐的ID -> 数量
+        :param tray_size: int，暂存区中的图案数量
+        :param pattern_id: 放入的图案ID；None 表示开启一组新的图案
+        :param match_size: int，消除所需的相同图案数量
+        :param storage_limit: int，暂存区容量
+        :return: bool
+        """
+        count = tray.get(pattern_id, 0) + 1 if pattern_id is not None else 1
+        if count == match_size:
+            return True  # 凑齐一组，暂存区减少
+        largest = max([count] + [c for i, c in tray.items() if i != pattern_id])
+        # 凑齐最接近完成的一组还需 match_size - largest 个图案，期间暂存区不能被填满
+        return tray_size + 1 + (match_size - largest) <= storage_limit
+
+    def place_in_reverse(self, clear_order):
+        """
+        按消除顺序的逆序摆放图案，后消除的先摆放在下层。
+
+        :param clear_order: list，按消除顺序排列的图案ID
+        :return: list，与 clear_order 一一对应的 Pattern 对象
+        """
+        layer_count = self.level_config['layer_count']
+        total = len(clear_order)
+        grid = SpatialGrid(self.pattern_size[0])
+        cx, cy = self.center
+        patterns = [None] * total
+
+        for placed, order_index in enumerate(reversed(range(total))):
+            pattern = Pattern(id=clear_order[order_index], size=self.pattern_size)
+            pattern.index = order_index
+            # 期望层级随摆放进度均匀上升，使各层图案数量大致相同
+            target_layer = min(placed * layer_count // total, layer_count - 1)
+
+            best_position = None
+            best_top = None
+            for _ in range(self.PLACEMENT_ATTEMPTS):
+                pattern.position = (cx + self.rng.uniform(-self.max_offset, self.max_offset),
+                                    cy + self.rng.uniform(-self.max_offset, self.max_offset))
+                overlapping = grid.query_overlaps(pattern)
+                top = max((p.layer for p in overlapping), default=-1)
+                if best_top is None or top < best_top:
+                    best_position, best_top = pattern.position, top
+                if top < target_layer:
+                    break
+
+            # 必须位于所有重叠图案之上；已到最高层时与其同层，同层图案互不遮挡
+            pattern.position = best_position
+            pattern.layer = min(max(best_top + 1, target_layer), layer_count - 1)
+            grid.insert(pattern)
+            patterns[order_index] = pattern
+        return patterns
@@ -0,0 +1,50 @@
+# core/clock.py
+
+import time
+
+
+class MonotonicClock:
+    """
+    真实时钟，读取单调递增的系统时间，用于交互式游戏。
+    """
+
+    def now(self):
+        """
+        获取当前时间。
+
+        :return: float，秒
+        """
+        return time.monotonic()
+
+
+class VirtualClock:
+    """
+    虚拟时钟，只在显式推进时前进，用于无界面模拟和回放，
+    可以瞬间跳过任意长的时间。
+    """
+
+    def __init__(self, start=0.0):
+        """
+        初始化虚拟时钟。
+
+        :param start: float，起始时间（秒）
+        """
+        self.current = float(start)
+
+    def now(self):
+        """
+        获取当前时间。
+
+        :return: float，秒
+        """
+        return self.current
+
+    def advance(self, seconds):
+        """
+        推进时钟。
+
+        :param seconds: float，推进的秒数，不能为负
+        """
+        if seconds < 0:
+            raise ValueError("虚拟时钟不能倒退。")
+        self.current += seconds
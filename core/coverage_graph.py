@@ -0,0 +1,223 @@
+# core/coverage_graph.py
+
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖，只有数组后端需要
+    np = None
+
+
+class CoverageGraph:
+    """
+    遮挡关系图（有向无环图），记录每个图案被哪些上层图案覆盖。
+    每个图案维护一个“未消除的覆盖者数量”，消除或恢复图案时只更新其相邻图案。
+    """
+
+    def __init__(self):
+        """
+        初始化空的遮挡关系图。
+        """
+        self.covers = {}      # 图案下标 -> 被该图案覆盖的下层图案列表
+        self.covered_by = {}  # 图案下标 -> 覆盖该图案的上层图案列表
+        # 图案可选状态变化的监听者，需实现 on_patterns_changed(patterns, source)，
+        # source 为消除状态发生变化的图案
+        self.listeners = []
+
+    @classmethod
+    def build(cls, patterns, spatial_index):
+        """
+        根据摆放好的图案和空间索引构建遮挡关系图，并挂接到每个图案上。
+
+        :param patterns: list，Pattern 对象列表
+        :param spatial_index: SpatialGrid，图案空间索引
+        :return: CoverageGraph
+        """
+        pairs = [
+            (pattern, other)
+            for pattern in patterns
+            for other in spatial_index.query_overlaps(pattern)
+            if other.layer > pattern.layer
+        ]
+        return cls.build_from_pairs(patterns, pairs)
+
+    @classmethod
+    def build_from_pairs(cls, patterns, pairs):
+        """
+        根据已知的遮挡关系构建遮挡关系图（例如由数组棋盘批量计算得到）。
+
+        :param patterns: list，Pattern 对象列表
+        :param pairs: 可迭代对象，(下层图案, 上层图案) 二元组
+        :return: CoverageGraph
+        """
+        graph = cls()
+        for pattern in patterns:
+            graph.covers[pattern.index] = []
+            graph.covered_by[pattern.index] = []
+        for below, above in pairs:
+            graph.covered_by[below.index].append(above)
+            graph.covers[above.index].append(below)
+        for pattern in patterns:
+            pattern.cover_count = sum(1 for p in graph.covered_by[pattern.index] if not p.is_cleared)
+            pattern.coverage_graph = graph
+        return graph
+
+    def on_cleared_changed(self, pattern):
+        """
+        图案的消除状态发生变化时调用，更新被它覆盖的图案的计数，
+        并把可选状态可能变化的图案通知给监听者。
+
+        :param pattern: Pattern 对象
+        """
+        delta = -1 if pattern.is_cleared else 1
+        # 计数在 0 和 1 之间变化的图案，其“是否被覆盖”状态随之改变
+        threshold = 0 if delta < 0 else 1
+        changed = [pattern]
+        for below in self.covers.get(pattern.index, ()):
+            below.cover_count += delta
+            if below.cover_count == threshold:
+                changed.append(below)
+        for listener in self.listeners:
+            listener.on_patterns_changed(changed, pattern)
+
+    def get_covering(self, pattern):
+        """
+        获取当前仍覆盖该图案的未消除图案。
+
+        :param pattern: Pattern 对象
+        :return: list，Pattern 对象
+        """
+        return [p for p in self.covered_by.get(pattern.index, ()) if not p.is_cleared]
+
+    def get_covered(self, pattern):
+        """
+        获取被该图案直接覆盖的下层图案。
+
+        :param pattern: Pattern 对象
+        :return: list，Pattern 对象
+        """
+        return self.covers.get(pattern.index, [])
+
+    def get_covered_with_count(self, pattern, count):
+        """
+        获取被该图案直接覆盖、未消除且覆盖数量等于指定值的下层图案。
+        例如 count 为 1 时，结果就是消除该图案后会露出的图案。
+
+        :param pattern: Pattern 对象
+        :param count: int，覆盖数量
+        :return: list，Pattern 对象
+        """
+        return [
+            below for below in self.covers.get(pattern.index, ())
+            if below.cover_count == count and not below.is_cleared
+        ]
+
+
+class ArrayCoverageGraph(CoverageGraph):
+    """
+    数组棋盘使用的遮挡关系图，邻接关系以 CSR 数组（偏移量 + 邻居下标）存储，
+    覆盖计数直接保存在 ArrayBoard.cover_counts 中，不为每条边创建 Python 对象。
+    """
+
+    def __init__(self, board, patterns, below, above):
+        """
+        根据遮挡关系下标数组初始化遮挡关系图。
+
+        :param board: ArrayBoard，所属的数组棋盘
+        :param patterns: list，PatternView 对象列表，下标与棋盘一致
+        :param below: numpy 数组，被覆盖图案的下标
+        :param above: numpy 数组，覆盖者的下标，above[k] 覆盖 below[k]
+        """
+        self.board = board
+        self.patterns = patterns
+        self.listeners = []
+        size = len(board)
+        self.covers_offsets, self.covers_targets = self.to_csr(above, below, size)
+        self.covered_by_offsets, self.covered_by_targets = self.to_csr(below, above, size)
+
+    @classmethod
+    def build_from_board(cls, board, patterns):
+        """
+        批量计算数组棋盘的遮挡关系并构建遮挡关系图，覆盖计数以向量运算一次算出。
+
+        :param board: ArrayBoard，数组棋盘
+        :param patterns: list，PatternView 对象列表
+        :return: ArrayCoverageGraph
+        """
+        below, above = board.coverage_pairs()
+        graph = cls(board, patterns, below, above)
+        active = ~board.cleared[above]
+        board.cover_counts[:] = np.bincount(below[active], minlength=len(board))
+        board.coverage_graph = graph
+        return graph
+
+    @staticmethod
+    def to_csr(sources, targets, size):
+        """
+        把 (起点, 终点) 边列表转换为 CSR 形式。
+
+        :param sources: numpy 数组，边的起点下标
+        :param targets: numpy 数组，边的终点下标
+        :param size: int，顶点数量
+        :return: (offsets, neighbors)，顶点 i 的邻居为 neighbors[offsets[i]:offsets[i + 1]]
+        """
+        order = np.argsort(sources, kind='stable')
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=offsets[1:])
+        return offsets, targets[order].astype(np.int32)
+
+    def covered_indices(self, index):
+        """
+        获取被指定图案直接覆盖的图案下标。
+
+        :param index: int，图案下标
+        :return: numpy 数组
+        """
+        return self.covers_targets[self.covers_offsets[index]:self.covers_offsets[index + 1]]
+
+    def on_cleared_changed(self, pattern):
+        """
+        图案的消除状态发生变化时调用，以向量运算更新被它覆盖的图案的计数。
+
+        :param pattern: PatternView 对象
+        """
+        delta = -1 if pattern.is_cleared else 1
+        threshold = 0 if delta < 0 else 1
+        below = self.covered_indices(pattern.index)
+        counts = self.board.cover_counts
+        # 同一图案覆盖的下层图案互不相同，可以直接按下标批量加减
+        counts[below] += delta
+        changed = [pattern]
+        changed.extend(self.patterns[i] for i in below[counts[below] == threshold].tolist())
+        for listener in self.listeners:
+            listener.on_patterns_changed(changed, pattern)
+
+    def get_covering(self, pattern):
+        """
+        获取当前仍覆盖该图案的未消除图案。
+
+        :param pattern: PatternView 对象
+        :return: list，PatternView 对象
+        """
+        offsets = self.covered_by_offsets
+        above = self.covered_by_targets[offsets[pattern.index]:offsets[pattern.index + 1]]
+        return [self.patterns[i] for i in above[~self.board.cleared[above]].tolist()]
+
+    def get_covered(self, pattern):
+        """
+        获取被该图案直接覆盖的下层图案。
+
+        :param pattern: PatternView 对象
+        :return: list，PatternView 对象
+        """
+        return [self.patterns[i] for i in self.covered_indices(pattern.index).tolist()]
+
+    def get_covered_with_count(self, pattern, count):
+        """
+        获取被该图案直接覆盖、未消除且覆盖数量等于指定值的下层图案。
+
+        :param pattern: PatternView 对象
+        :param count: int，覆盖数量
+        :return: list，PatternView 对象
+        """
+        below = self.covered_indices(pattern.index)
+        mask = (self.board.cover_counts[below] == count) & ~self.board.cleared[below]
+        return [self.patterns[i] for i in below[mask].tolist()]
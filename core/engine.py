@@ -0,0 +1,214 @@
+# core/engine.py
+
+from core.clock import VirtualClock
+from core.game_logic import GameLogic
+from core.events import TIMEOUT
+from core.replay import ACTION_SELECT, ACTION_HINT, ACTION_UNDO, ACTION_REDO, ACTION_TIME_BONUS, ACTION_TIMEOUT
+from data.levels import LevelManager
+
+
+class HeadlessGame:
+    """
+    无界面游戏引擎，不依赖 pygame 和显示设备。
+    通过关卡配置和随机种子创建游戏，按图案下标执行操作并查询状态，
+    可用于测试、机器人和服务器端的大批量模拟。
+    计时使用虚拟时钟，时间只在调用 advance_time 时前进，超时可以瞬间模拟。
+    """
+
+    # 与 UIManager 相同的逻辑屏幕尺寸，保证图案大小和分布一致
+    SCREEN_SIZE = (500, 780)
+
+    def __init__(self, level_config, seed=None, board_backend='objects', screen_size=None, clock=None):
+        """
+        创建一局无界面游戏。
+
+        :param level_config: dict，关卡配置参数
+        :param seed: int，随机种子
+        :param board_backend: str，棋盘后端，'objects' 或 'array'
+        :param screen_size: (width, height)，逻辑屏幕尺寸，默认与界面一致
+        :param clock: 时钟对象，默认新建一个从 0 开始的 VirtualClock
+        """
+        self.level_config = level_config
+        self.clock = clock if clock is not None else VirtualClock()
+        self.game_logic = GameLogic(
+            level_config,
+            *(screen_size or self.SCREEN_SIZE),
+            board_backend=board_backend,
+            seed=seed,
+            verbose=False,
+            leaderboard_path=None,
+            clock=self.clock
+        )
+        self.seed = self.game_logic.seed
+        self.move_count = 0  # 成功执行的选择次数
+
+    @classmethod
+    def from_mode(cls, mode, seed=None, board_backend='objects'):
+        """
+        按游戏模式名称创建游戏。
+
+        :param mode: str，游戏模式（'easy', 'hard', 'hell'）
+        :param seed: int，随机种子
+        :param board_backend: str，棋盘后端
+        :return: HeadlessGame
+        """
+        level_config = LevelManager().get_level_config(mode)
+        if level_config is None:
+            raise ValueError(f"未知的游戏模式：{mode}")
+        return cls(level_config, seed=seed, board_backend=board_backend)
+
+    @classmethod
+    def from_replay(cls, replay, board_backend='objects'):
+        """
+        按回放中的种子、配置和屏幕尺寸重建对局（不执行操作）。
+
+        :param replay: Replay 对象
+        :param board_backend: str，棋盘后端
+        :return: HeadlessGame
+        """
+        return cls(replay.level_config, seed=replay.seed, board_backend=board_backend,
+                   screen_size=replay.screen_size)
+
+    def play_replay(self, replay):
+        """
+        依次执行回放中的所有操作。
+
+        :param replay: Replay 对象
+        :return: int，执行的操作数量
+        """
+        count = 0
+        for action, index in replay.iter_actions():
+            if action == ACTION_SELECT:
+                self.select(index)
+            elif action == ACTION_HINT:
+                self.use_hint()
+            elif action == ACTION_UNDO:
+                self.use_undo()
+            elif action == ACTION_REDO:
+                self.game_logic.redo_move()
+            elif action == ACTION_TIME_BONUS:
+                self.use_time_bonus()
+            elif action == ACTION_TIMEOUT:
+                self.expire_time()
+            count += 1
+        return count
+
+    @property
+    def tile_count(self):
+        return len(self.game_logic.patterns)
+
+    @property
+    def is_over(self):
+        return self.game_logic.is_game_over
+
+    @property
+    def is_victory(self):
+        return self.game_logic.is_victory
+
+    @property
+    def is_timeout(self):
+        return self.game_logic.is_game_over and self.game_logic.timer.time_up()
+
+    @property
+    def time_remaining(self):
+        return self.game_logic.timer.remaining_time
+
+    def legal_actions(self):
+        """
+        获取当前可以选择的图案下标。
+
+        :return: list，按下标升序排列
+        """
+        if self.game_logic.is_game_over:
+            return []
+        free = self.game_logic.hint_index.free_by_id
+        return sorted(index for patterns in free.values() for index in patterns)
+
+    def select(self, index):
+        """
+        选择指定下标的图案。
+
+        :param index: int，图案下标
+        :return: bool，是否成功选择
+        """
+        if not 0 <= index < self.tile_count:
+            raise IndexError(f"图案下标越界：{index}")
+        if not self.game_logic.select_pattern(self.game_logic.patterns[index]):
+            return False
+        self.move_count += 1
+        self.game_logic.update()
+        return True
+
+    def advance_time(self, seconds):
+        """
+        推进虚拟时钟并更新游戏状态，时间到期时游戏以超时结束。
+        只能用于虚拟时钟。
+
+        :param seconds: float，推进的秒数
+        :return: bool，游戏是否已结束
+        """
+        if not self.game_logic.is_game_over:
+            self.clock.advance(seconds)
+            self.game_logic.update()
+        return self.game_logic.is_game_over
+
+    def expire_time(self):
+        """
+        把虚拟时钟推进到倒计时结束，游戏以超时结束。
+        用于回放中记录的超时操作。只能用于虚拟时钟。
+        """
+        if self.game_logic.is_game_over:
+            return
+        self.advance_time(max(self.time_remaining, 0))
+        # 浮点误差或固定步长取整可能使计时器差一点才到期，此时直接按超时结束
+        self.game_logic.finish_game(False, TIMEOUT)
+
+    def use_time_bonus(self):
+        """
+        使用加时道具。
+
+        :return: bool，是否成功使用
+        """
+        return self.game_logic.use_time_bonus()
+
+    def use_hint(self):
+        """
+        使用提示道具。
+
+        :return: list，提示的图案下标；没有提示或次数用完时返回 None
+        """
+        self.game_logic.hint_patterns = []
+        self.game_logic.use_hint()
+        if not self.game_logic.hint_patterns:
+            return None
+        return [p.index for p in self.game_logic.hint_patterns]
+
+    def use_undo(self):
+        """
+        使用撤销道具。
+
+        :return: bool，是否成功撤销
+        """
+        used_before = self.game_logic.item_manager.undo_used
+        self.game_logic.use_undo()
+        return self.game_logic.item_manager.undo_used > used_before
+
+    def get_state(self):
+        """
+        获取当前游戏状态的快照。
+
+        :return: dict
+        """
+        game_logic = self.game_logic
+        return {
+            'seed': self.seed,
+            'cleared': [p.is_cleared for p in game_logic.patterns],
+            'storage': [p.id for p in game_logic.player.storage],
+            'score': game_logic.player.score,
+            'move_count': self.move_count,
+            'hints_left': game_logic.item_manager.hint_limit - game_logic.item_manager.hint_used,
+            'undos_left': game_logic.item_manager.undo_limit - game_logic.item_manager.undo_used,
+            'time_remaining': game_logic.timer.remaining_time,
+            'is_game_over': game_logic.is_game_over,
+            'is_victory': game_logic.is_victory,
+        }
@@ -0,0 +1,51 @@
+# core/events.py
+
+# 游戏生命周期事件
+TILE_CLEARED = 'tile_cleared'    # 图案从棋盘移入暂存区，参数：pattern
+TILE_RESTORED = 'tile_restored'  # 撤销后图案回到棋盘，参数：pattern
+MATCH = 'match'                  # 暂存区凑齐一组并消除，参数：patterns
+STORAGE_FULL = 'storage_full'    # 暂存区已满导致失败
+VICTORY = 'victory'              # 棋盘上的图案全部消除
+TIMEOUT = 'timeout'              # 倒计时结束
+GAME_OVER = 'game_over'          # 游戏结束（在 victory/timeout/storage_full 之后触发），参数：victory, reason
+
+
+class EventBus:
+    """
+    简单的同步事件总线：按事件名称登记处理函数，触发时按登记顺序依次调用。
+    """
+
+    def __init__(self):
+        self.handlers = {}  # 事件名称 -> 处理函数列表
+
+    def subscribe(self, event, handler):
+        """
+        登记事件处理函数。
+
+        :param event: str，事件名称
+        :param handler: 可调用对象，以关键字参数接收事件数据
+        """
+        self.handlers.setdefault(event, []).append(handler)
+
+    def unsubscribe(self, event, handler):
+        """
+        取消登记事件处理函数，未登记时忽略。
+
+        :param event: str，事件名称
+        :param handler: 可调用对象
+        """
+        handlers = self.handlers.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def emit(self, event, **data):
+        """
+        触发事件。
+
+        :param event: str，事件名称
+        :param data: 事件数据
+        """
+        handlers = self.handlers.get(event)
+        if handlers:
+            for handler in list(handlers):
+                handler(**data)
@@ -5,7 +5,16 @@ from core.player import Player
 from core.timer import Timer
 from data.items import ItemManager
 from core.pattern import Pattern  # 确保 Pattern 类存在并正确导入
-import copy  # 用于深拷贝
+from core.spatial_index import SpatialGrid
+from core.coverage_graph import CoverageGraph, ArrayCoverageGraph
+from core.board_array import ArrayBoard
+from core.hint_index import HintIndex
+from core.board_generator import SolvableBoardGenerator
+from core.move_journal import Move, MoveJournal
+from core.replay import (Replay, ACTION_SELECT, ACTION_HINT, ACTION_UNDO, ACTION_REDO, ACTION_TIME_BONUS,
+                         ACTION_TIMEOUT)
+from core.events import (EventBus, TILE_CLEARED, TILE_RESTORED, MATCH, STORAGE_FULL,
+                         VICTORY, TIMEOUT, GAME_OVER)
 from core.leaderboard_manager import LeaderboardManager
 
 class GameLogic:
@@ -13,15 +22,33 @@ class GameLogic:
     游戏逻辑类，处理图案生成、分层摆放、匹配和消除机制。
     """
 
-    def __init__(self, level_config, screen_width, screen_height):
+    def __init__(self, level_config, screen_width, screen_height, board_backend='objects',
+                 seed=None, verbose=True, leaderboard_path='leaderboard.json', clock=None,
+                 leaderboard_manager=None):
         """
         初始化游戏逻辑。
 
         :param level_config: dict，关卡配置参数，包括图案种类、数量、层数等。
+                             可选的 'generator' 为 'random'（随机摆放）或 'solvable'（保证可解），
+                             'history_depth' 为最多可撤销的步数，'match_size' 为消除所需的相同图案数量，
+                             'time_tick' 为计时的固定步长（秒），'time_bonus_limit'/'time_bonus_seconds' 为加时道具配置。
         :param screen_width: int，屏幕宽度
         :param screen_height: int，屏幕高度
+        :param board_backend: str，棋盘后端，'objects'（每个图案一个对象）或 'array'（NumPy 数组，适合超大棋盘）
+        :param seed: int，随机种子，相同的种子和配置生成相同的棋盘；为 None 时随机选取
+        :param verbose: bool，是否输出调试信息
+        :param leaderboard_path: str，排行榜文件路径；为 None 时不记录排行榜（例如无界面模拟）
+        :param clock: 时钟对象，默认使用真实时钟；无界面模拟可传入 VirtualClock 瞬间推进时间
+        :param leaderboard_manager: LeaderboardManager，与界面共享的排行榜管理器；给出时忽略 leaderboard_path
         """
-        self.leaderboard_manager = LeaderboardManager('leaderboard.json')  # 初始化排行榜管理器
+        self.verbose = verbose
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)  # 本局独立的随机数生成器
+        # 初始化排行榜管理器
+        if leaderboard_manager is not None:
+            self.leaderboard_manager = leaderboard_manager
+        else:
+            self.leaderboard_manager = LeaderboardManager(leaderboard_path) if leaderboard_path else None
         self.hovered_pattern = None  # 用于存储当前鼠标悬停的图案
         self.hint_patterns = []  # 初始化 hint_patterns
         self.level_config = level_config
@@ -30,73 +57,109 @@ class GameLogic:
         self.pattern_size = (int(screen_width * 0.2), int(screen_width * 0.2))  # 增大图案尺寸为屏幕宽度的20%
         self.patterns = []          # 存储所有图案对象
         self.layers = []            # 存储分层摆放的图案列表
-        self.player = Player(level_config['storage_limit'])      # 玩家对象
-        self.timer = Timer(level_config['time_limit'])  # 倒计时器
+        self.spatial_index = None   # 图案空间索引，在摆放完成后构建
+        self.coverage_graph = None  # 图案遮挡关系图，在摆放完成后构建
+        self.board_backend = board_backend
+        self.board = None           # 数组棋盘，仅在 'array' 后端下使用
+        self.hint_index = None      # 提示索引，在遮挡关系图构建后创建
+        self.solution = None        # 可解模式下的见证解（按顺序消除的图案下标）
+        self.match_size = level_config.get('match_size', 3)
+        self.player = Player(level_config['storage_limit'], verbose=verbose, match_size=self.match_size)  # 玩家对象
+        self.timer = Timer(
+            level_config['time_limit'],
+            clock=clock,
+            tick=level_config.get('time_tick'),
+            verbose=verbose
+        )  # 倒计时器
         self.is_game_over = False   # 游戏结束标志
         self.is_victory = False     # 游戏胜利标志
+        self.remaining_tiles = 0    # 棋盘上尚未消除的图案数量，在摆放完成后设置
+        self.result_recorded = False  # 本局结果是否已写入排行榜
+        self.events = EventBus()    # 游戏生命周期事件
+        self.events.subscribe(GAME_OVER, lambda **_: self.end_game())
 
         self.item_manager = ItemManager(
             level_config.get('hint_limit', 5),
-            level_config.get('undo_limit', 3)
+            level_config.get('undo_limit', 3),
+            verbose=verbose,
+            time_bonus_limit=level_config.get('time_bonus_limit', 0),
+            time_bonus_seconds=level_config.get('time_bonus_seconds', 30)
         )  # 道具管理器
 
-        self.history = []  # 添加历史记录栈
+        self.journal = MoveJournal(level_config.get('history_depth', 10))  # 可撤销/重做的操作日志
+        self.replay = Replay(self.seed, level_config, (screen_width, screen_height))  # 本局的操作回放
 
-        self.generate_patterns()
-        self.arrange_patterns()
+        if level_config.get('generator', 'random') == 'solvable':
+            self.generate_solvable_board()
+        else:
+            self.generate_patterns()
+            self.arrange_patterns()
+        if self.board_backend == 'array':
+            self.build_array_board()
+        self.build_spatial_index()
+        self.build_coverage_graph()
+        self.hint_index = HintIndex.build(self.patterns, self.coverage_graph, self.match_size)
+        self.remaining_tiles = sum(1 for pattern in self.patterns if not pattern.is_cleared)
 
     def use_undo(self):
         """
         使用撤销功能，恢复到上一个游戏状态。
         """
+        self.replay.record(ACTION_UNDO)
         if self.item_manager.can_use_undo():
-            success = self.item_manager.use_undo(self.player)
+            success = self.item_manager.use_undo(self)
             if success:
-                self.restore_state()
-                print("撤销成功。")
+                if self.verbose:
+                    print("撤销成功。")
             else:
-                print("无法撤销。")
+                if self.verbose:
+                    print("无法撤销。")
         else:
-            print("撤销次数已用完。")
+            if self.verbose:
+                print("撤销次数已用完。")
+
+    def use_time_bonus(self):
+        """
+        使用加时道具，增加倒计时时间。
+
+        :return: bool，表示是否成功使用
+        """
+        self.replay.record(ACTION_TIME_BONUS)
+        return self.item_manager.use_time_bonus(self)
+
+    def pause(self):
+        """
+        暂停游戏计时。
+        """
+        self.timer.pause()
+
+    def resume(self):
+        """
+        恢复游戏计时。
+        """
+        self.timer.resume()
 
     def use_hint(self):
         """
         使用提示功能，查找可消除的图案并进行提示。
         """
+        self.replay.record(ACTION_HINT)
         hint = self.item_manager.use_hint(self)
         if hint:
             self.hint_patterns = hint
-            print("提示已更新，找到可消除的图案。")
+            if self.verbose:
+                print("提示已更新，找到可消除的图案。")
         else:
-            print("没有可用的提示。")
+            if self.verbose:
+                print("没有可用的提示。")
 
     def find_hint(self):
         """
         查找可消除的图案组合，用于提示功能。
-        优化逻辑：优先查找未被遮挡、位于上层的图案组合。
-        :return: list，包含可消除的图案对象
-        """
-        pattern_counts = {}
-
-        # 统计玩家已经选中的图案数量
-        for pattern in self.player.selected_patterns:
-            pattern_counts[pattern.id] = pattern_counts.get(pattern.id, 0) + 1
-
-        # 优先提示未被遮挡且位于上层的图案
-        for layer_index in reversed(range(len(self.layers))):  # 从顶层开始检查
-            layer = self.layers[layer_index]
-            for pattern in layer:
-                if not pattern.is_cleared and not self.is_pattern_covered(pattern):
-                    temp_count = pattern_counts.get(pattern.id, 0) + 1
-                    if temp_count >= 3:
-                        # 找到一个可消除的组合，确保不被覆盖
-                        hint_patterns = [
-                            p for p in self.patterns
-                            if p.id == pattern.id and not p.is_cleared and not self.is_pattern_covered(p)
-                        ]
-                        if len(hint_patterns) >= 3:
-                            return hint_patterns[:3]
-        return None
+        由提示索引直接给出：优先需要点击次数最少、能露出更多图案、位于上层的组合。
+        :return: list，包含需要点击的图案对象
+        """
+        return self.hint_index.best_hint(self.player)
 
     def generate_patterns(self):
         """
@@ -105,19 +168,22 @@ class GameLogic:
         pattern_types = self.level_config['pattern_types']  # 图案种类数
         total_patterns = self.level_config['total_patterns']  # 总图案数量
 
-        # 确保总图案数量是3的倍数，以满足三消规则
-        if total_patterns % 3 != 0:
-            total_patterns += 3 - (total_patterns % 3)
+        # 确保总图案数量是消除数量（默认3）的倍数，以满足消除规则
+        match_size = self.match_size
+        if total_patterns % match_size != 0:
+            total_patterns += match_size - (total_patterns % match_size)
 
         pattern_ids = []
-        for i in range(total_patterns // 3):
+        for i in range(total_patterns // match_size):
             pattern_id = i % pattern_types
-            pattern_ids.extend([pattern_id] * 3)  # 每种图案添加3个
+            pattern_ids.extend([pattern_id] * match_size)  # 每种图案添加一组
 
-        random.shuffle(pattern_ids)  # 打乱图案顺序
+        self.rng.shuffle(pattern_ids)  # 打乱图案顺序
 
         # 创建图案对象并添加到列表
         self.patterns = [Pattern(id=pid, size=self.pattern_size) for pid in pattern_ids]
+        for index, pattern in enumerate(self.patterns):
+            pattern.index = index
 
     def arrange_patterns(self):
         """
@@ -138,39 +204,90 @@ class GameLogic:
             for pattern in layer_patterns:
                 pattern.layer = layer_index
                 # 在中心点附近随机生成偏移量
-                offset_x = random.uniform(-max_offset, max_offset)
-                offset_y = random.uniform(-max_offset, max_offset)
+                offset_x = self.rng.uniform(-max_offset, max_offset)
+                offset_y = self.rng.uniform(-max_offset, max_offset)
                 pattern.position = (center_x + offset_x, center_y + offset_y)
 
+    def generate_solvable_board(self):
+        """
+        通过倒放生成保证可解的棋盘，并记录见证解。
+        """
+        generator = SolvableBoardGenerator(
+            self.level_config,
+            self.pattern_size,
+            (self.screen_width / 2, self.screen_height / 2),
+            self.pattern_size[0] * 2,  # 与 arrange_patterns 相同的分布范围
+            rng=self.rng
+        )
+        self.patterns, self.layers, self.solution = generator.generate()
+
+    def build_array_board(self):
+        """
+        将摆放好的图案转存到数组棋盘，之后的图案对象都是数组的视图。
+        """
+        self.board = ArrayBoard.from_patterns(self.patterns)
+        self.patterns = self.board.views()
+        self.layers = [[self.patterns[p.index] for p in layer] for layer in self.layers]
+
+    def build_spatial_index(self):
+        """
+        根据摆放好的图案构建空间索引，用于点击检测和遮挡判断。
+        """
+        self.spatial_index = SpatialGrid.build(self.patterns, self.pattern_size[0])
+
+    def build_coverage_graph(self):
+        """
+        构建图案遮挡关系图，之后每个图案的可选状态可直接读取。
+        """
+        if self.board is not None:
+            self.coverage_graph = ArrayCoverageGraph.build_from_board(self.board, self.patterns)
+        else:
+            self.coverage_graph = CoverageGraph.build(self.patterns, self.spatial_index)
+
     def update(self):
         """
         更新游戏逻辑，每帧调用一次。
+        胜利和暂存区已满在选择图案时即时判定，这里只需检查倒计时，与棋盘大小无关。
         """
+        if self.is_game_over:
+            return
+
         # 更新倒计时器
         self.timer.update()
 
         # 检查倒计时是否结束
         if self.timer.time_up():
-            self.is_game_over = True
-            self.is_victory = False
-            self.end_game()
+            self.replay.record(ACTION_TIMEOUT)
+            self.finish_game(False, TIMEOUT)
 
-        # 检查是否所有图案都已消除
-        if all(pattern.is_cleared for pattern in self.patterns):
-            self.is_game_over = True
-            self.is_victory = True
-            self.end_game()
+    def finish_game(self, victory, reason):
+        """
+        结束游戏并依次触发结束原因事件和 game_over 事件。
+
+        :param victory: bool，是否胜利
+        :param reason: str，结束原因（VICTORY、TIMEOUT 或 STORAGE_FULL）
+        """
+        if self.is_game_over:
+            return
+        self.is_game_over = True
+        self.is_victory = victory
+        self.events.emit(reason)
+        self.events.emit(GAME_OVER, victory=victory, reason=reason)
 
     def end_game(self, player_name="Player1"):
         """
         处理游戏结束逻辑，记录分数和时间到排行榜。
+        由 game_over 事件触发，每局只记录一次（撤销后再次结束也不会重复记录）。
         :param player_name: 玩家姓名
         """
-        if self.is_game_over:
+        if self.is_game_over and not self.result_recorded:
+            self.result_recorded = True
             score = self.player.score
             time_taken = self.timer.get_time_taken()
-            self.leaderboard_manager.add_score(player_name, score, time_taken)
-            print(f"游戏结束。得分：{score}，用时：{time_taken}秒。")
+            if self.leaderboard_manager is not None:
+                self.leaderboard_manager.add_score(player_name, score, time_taken)
+            if self.verbose:
+                print(f"游戏结束。得分：{score}，用时：{time_taken}秒。")
             # 可以在这里添加更多的结束游戏逻辑，例如显示结束界面等
 
     def handle_player_action(self, mouse_pos):
@@ -179,111 +296,144 @@ class GameLogic:
 
         :param mouse_pos: (x, y) 鼠标点击位置坐标
         """
-        # 保存当前状态到历史记录
-        self.save_state()
-
         # 查找点击位置对应的图案
         clicked_pattern = self.get_pattern_at_position(mouse_pos)
         self.hint_patterns.clear()
         if clicked_pattern:
-            if clicked_pattern.is_selectable():
-                self.player.select_pattern(clicked_pattern)
-                # 将图案标记为已消除
-                clicked_pattern.is_cleared = True
-
-                # 检查玩家暂存区是否有三个相同的图案
-                if self.player.check_for_match():
-                    matched_patterns = self.player.remove_matched_patterns()
-                    # 已在 remove_matched_patterns 中处理暂存区的图案
-
-                # 检查暂存区是否已满
-                if self.player.is_storage_full():
-                    self.is_game_over = True
-                    self.is_victory = False
-            else:
+            self.select_pattern(clicked_pattern)
+
+    def select_pattern(self, pattern):
+        """
+        玩家选择一个图案，成功时记录到操作日志。
+
+        :param pattern: Pattern 对象
+        :return: bool，是否成功选择
+        """
+        if self.is_game_over:
+            return False
+        if not pattern.is_selectable():
+            if self.verbose:
                 print("该图案被覆盖，无法选择。")
+            return False
+        move = self.apply_selection(pattern)
+        if move is None:
+            return False
+        self.journal.record(move)
+        self.replay.record(ACTION_SELECT, pattern.index)
         self.hint_patterns.clear()
+        return True
 
-    def get_pattern_at_position(self, position):
+    def apply_selection(self, pattern):
         """
-        根据位置获取对应的图案对象。
+        选择一个图案：放入暂存区、标记为已消除并处理三消，返回本步的增量记录。
 
-        :param position: (x, y) 坐标
-        :return: Pattern 对象或 None
+        :param pattern: Pattern 对象，可选择的图案
+        :return: Move 对象；暂存区已满时返回 None
         """
-        for layer in reversed(self.layers):  # 从顶层开始检查
-            for pattern in layer:
-                if pattern.contains_point(position) and not pattern.is_cleared:
-                    # 检查图案是否未被覆盖
-                    if not self.is_pattern_covered(pattern):
-                        return pattern
-        return None
-
-    def is_pattern_covered(self, pattern):
+        if self.player.is_storage_full():
+            return None
+        was_game_over, was_victory = self.is_game_over, self.is_victory
+        score_before = self.player.score
+
+        self.player.select_pattern(pattern)
+        # 将图案标记为已消除
+        pattern.is_cleared = True
+        self.remaining_tiles -= 1
+        self.events.emit(TILE_CLEARED, pattern=pattern)
+
+        # 检查玩家暂存区是否有凑齐的相同图案，记录被消除分组的位置以便撤销
+        matched = []
+        if self.player.check_for_match():
+            matched = self.player.pop_matches()
+            for _, patterns in matched:
+                self.events.emit(MATCH, patterns=patterns)
+        move = Move(pattern, matched, self.player.score - score_before, was_game_over, was_victory)
+
+        # 棋盘清空即胜利，否则检查暂存区是否已满
+        if self.remaining_tiles == 0:
+            self.finish_game(True, VICTORY)
+        elif self.player.is_storage_full():
+            self.finish_game(False, STORAGE_FULL)
+
+        return move
+
+    def undo_move(self):
         """
-        判断图案是否被其他图案覆盖。
+        撤销上一步操作，只回退该步的增量。
 
-        :param pattern: Pattern 对象
-        :return: bool
+        :return: bool，表示是否成功撤销；失败时游戏状态和操作日志保持不变
         """
-        for higher_layer_index in range(pattern.layer + 1, len(self.layers)):
-            higher_layer = self.layers[higher_layer_index]
-            for other_pattern in higher_layer:
-                if other_pattern.overlaps(pattern) and not other_pattern.is_cleared:
-                    return True
-        return False
-
-    def save_state(self):
-        """
-        保存当前游戏状态到历史记录栈。
-        """
-        MAX_HISTORY = 10  # 设置最大历史记录数
-        state = {
-            'patterns': [(p.id, p.position, p.is_cleared) for p in self.patterns],
-            'player_selected_patterns': [p.id for p in self.player.selected_patterns],
-            'player_score': self.player.score,
-            'player_storage': [p.id for p in self.player.storage],  # 修正为保存 storage
-            'is_game_over': self.is_game_over,
-            'is_victory': self.is_victory,
-            'timer_remaining_time': self.timer.remaining_time,
-            # 如果有更多需要保存的状态，可以继续添加
-        }
-        if len(self.history) >= MAX_HISTORY:
-            self.history.pop(0)  # 移除最旧的历史记录
-        self.history.append(copy.deepcopy(state))
-        print("游戏状态已保存。")
-
-    def restore_state(self):
-        """
-        从历史记录栈中恢复上一个游戏状态。
-        """
-        if not self.history:
-            print("没有可撤销的操作。")
+        move = self.journal.peek_undo()
+        if move is None:
+            if self.verbose:
+                print("没有可撤销的操作。")
+            return False
+        if not self.player.undo(move.pattern, move.matched, move.score_delta):
             return False
+        self.journal.pop_undo()
+        self.remaining_tiles += 1
+        self.events.emit(TILE_RESTORED, pattern=move.pattern)
+        self.is_game_over = move.was_game_over
+        self.is_victory = move.was_victory
+        self.hint_patterns.clear()
+        return True
+
+    def redo_move(self):
+        """
+        重做最近一次撤销的操作。
 
-        state = self.history.pop()
-        print("恢复游戏状态。")
+        :return: bool，表示是否成功重做
+        """
+        move = self.journal.pop_redo()
+        if move is None:
+            if self.verbose:
+                print("没有可重做的操作。")
+            return False
+        self.apply_selection(move.pattern)
+        self.replay.record(ACTION_REDO)
+        self.hint_patterns.clear()
+        return True
 
-        # 恢复图案状态
-        for pattern, (pid, pos, is_cleared) in zip(self.patterns, state['patterns']):
-            pattern.id = pid
-            pattern.position = pos
-            pattern.is_cleared = is_cleared
+    def save_replay(self, directory='replays'):
+        """
+        记录本局结果并把回放保存到文件。
 
-        # 恢复玩家选中的图案
-        self.player.selected_patterns = [p for p in self.patterns if p.id in state['player_selected_patterns']]
+        :param directory: str，回放保存目录
+        :return: str，回放文件路径；保存失败时返回 None
+        """
+        self.replay.record_result(self.player.score, self.is_game_over, self.is_victory)
+        try:
+            path = self.replay.save(directory)
+        except OSError as e:
+            if self.verbose:
+                print(f"保存回放出错：{e}")
+            return None
+        if self.verbose:
+            print(f"回放已保存：{path}")
+        return path
 
-        # 恢复玩家分数
-        self.player.score = state.get('player_score', self.player.score)
+    def get_pattern_at_position(self, position):
+        """
+        根据位置获取对应的图案对象。
 
-        # 恢复玩家暂存区
-        self.player.storage = [p for p in self.patterns if p.id in state.get('player_storage', [])]
+        :param position: (x, y) 坐标
+        :return: Pattern 对象或 None
+        """
+        if self.board is not None:
+            index = self.board.topmost_uncovered_at(position)
+            return self.patterns[index] if index >= 0 else None
 
-        # 恢复游戏结束和胜利状态
-        self.is_game_over = state['is_game_over']
-        self.is_victory = state['is_victory']
+        # 只检查包含该点的图案，取绘制顺序 (层级, 下标) 最靠后、即画在最上面的未被覆盖图案
+        candidates = [p for p in self.spatial_index.query_point(position) if p.is_selectable()]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda p: (p.layer, p.index))
 
-        # 恢复倒计时
-        self.timer.remaining_time = state['timer_remaining_time']
+    def is_pattern_covered(self, pattern):
+        """
+        判断图案是否被其他图案覆盖。
 
-        return True
+        :param pattern: Pattern 对象
+        :return: bool
+        """
+        return pattern.cover_count > 0
@@ -0,0 +1,185 @@
+# core/hint_index.py
+
+import heapq
+
+
+class HintIndex:
+    """
+    提示索引，按图案ID维护当前未消除且未被覆盖的图案集合。
+    每个ID另有一个按 (露出数量, 层级, -下标) 排序的堆，图案的露出数量在遮挡关系变化时增量更新，
+    结合玩家暂存区中各ID的数量，可直接给出最优的提示组合。
+    """
+
+    def __init__(self, coverage_graph, match_size=3):
+        """
+        初始化提示索引。
+
+        :param coverage_graph: CoverageGraph，图案遮挡关系图
+        :param match_size: int，消除所需的相同图案数量
+        """
+        self.coverage_graph = coverage_graph
+        self.match_size = match_size
+        self.free_by_id = {}  # 图案ID -> {图案下标: Pattern}，当前可选的图案
+        self.scores = {}      # 图案下标 -> 露出数量，只保存当前可选的图案
+        # 图案ID -> 堆，元素为 (-露出数量, -层级, 下标)；
+        # 过期的元素不立即删除，取堆顶时与 scores 对比后丢弃
+        self.heaps = {}
+
+    @classmethod
+    def build(cls, patterns, coverage_graph, match_size=3):
+        """
+        根据当前棋盘构建提示索引，并注册为遮挡关系图的监听者。
+
+        :param patterns: list，Pattern 对象列表
+        :param coverage_graph: CoverageGraph，图案遮挡关系图
+        :param match_size: int，消除所需的相同图案数量
+        :return: HintIndex
+        """
+        index = cls(coverage_graph, match_size)
+        index.on_patterns_changed(patterns)
+        coverage_graph.listeners.append(index)
+        return index
+
+    def on_patterns_changed(self, patterns, source=None):
+        """
+        图案的可选状态可能发生变化时调用，更新对应ID的集合，
+        并重新计算露出数量可能变化的可选图案。
+
+        :param patterns: 可迭代对象，Pattern 对象
+        :param source: Pattern 对象，消除状态发生变化的图案；初始构建时为 None
+        """
+        for pattern in patterns:
+            free = self.free_by_id.setdefault(pattern.id, {})
+            if pattern.is_selectable():
+                free[pattern.index] = pattern
+                self.update_score(pattern)
+            else:
+                free.pop(pattern.index, None)
+                self.scores.pop(pattern.index, None)
+        if source is None:
+            return
+        graph = self.coverage_graph
+        # 消除 source 后只剩一个覆盖者的图案，会计入该覆盖者的露出数量；
+        # 恢复 source 后覆盖数量变为 2 的图案，则不再计入原先唯一覆盖者的露出数量
+        count = 1 if source.is_cleared else 2
+        affected = graph.get_covering(source) if source.cover_count == 1 else []
+        for below in graph.get_covered_with_count(source, count):
+            affected.extend(graph.get_covering(below))
+        for pattern in affected:
+            if pattern.index in self.scores:
+                self.update_score(pattern)
+
+    def update_score(self, pattern):
+        """
+        重新计算可选图案的露出数量，分数变化时压入新的堆元素。
+
+        :param pattern: Pattern 对象
+        """
+        score = self.uncover_score(pattern)
+        if self.scores.get(pattern.index) == score:
+            return
+        self.scores[pattern.index] = score
+        heap = self.heaps.setdefault(pattern.id, [])
+        heapq.heappush(heap, (-score, -pattern.layer, pattern.index))
+        # 过期元素过多时重建堆，避免堆随操作次数无限增长
+        if len(heap) > 4 * len(self.free_by_id[pattern.id]) + 16:
+            self.compact(pattern.id)
+
+    def compact(self, pattern_id):
+        """
+        丢弃指定ID的堆中所有过期元素。
+
+        :param pattern_id: int，图案ID
+        """
+        heap = [
+            (-self.scores[index], -pattern.layer, index)
+            for index, pattern in self.free_by_id.get(pattern_id, {}).items()
+        ]
+        heapq.heapify(heap)
+        self.heaps[pattern_id] = heap
+
+    def is_current(self, entry):
+        """
+        判断堆元素是否仍对应可选图案的当前分数。
+
+        :param entry: 堆元素
+        :return: bool
+        """
+        return self.scores.get(entry[2]) == -entry[0]
+
+    def top_patterns(self, pattern_id, count):
+        """
+        获取指定ID中优先级最高的若干可选图案。
+
+        :param pattern_id: int，图案ID
+        :param count: int，需要的数量
+        :return: list，(Pattern, 露出数量)，按优先级从高到低排列
+        """
+        heap = self.heaps.get(pattern_id, [])
+        taken = []
+        while heap and len(taken) < count:
+            entry = heapq.heappop(heap)
+            # 分数变回旧值时同一图案可能有两个相同的元素，只保留一个
+            if self.is_current(entry) and (not taken or taken[-1] != entry):
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        free = self.free_by_id[pattern_id]
+        return [(free[entry[2]], -entry[0]) for entry in taken]
+
+    def get_free_patterns(self, pattern_id):
+        """
+        获取指定ID当前可选的图案。
+
+        :param pattern_id: int，图案ID
+        :return: list，Pattern 对象
+        """
+        return list(self.free_by_id.get(pattern_id, {}).values())
+
+    def uncover_score(self, pattern):
+        """
+        计算消除该图案后会露出（不再被覆盖）的图案数量。
+
+        :param pattern: Pattern 对象
+        :return: int
+        """
+        return len(self.coverage_graph.get_covered_with_count(pattern, 1))
+
+    def iter_hints(self, player):
+        """
+        依次给出每个ID的可行提示组合及其排序键。
+
+        :param player: Player 对象，用于读取暂存区中各ID的数量
+        :return: 生成器，产生 (排序键, 需要点击的 Pattern 列表, 露出的图案数量)
+        """
+        free_slots = player.storage_limit - player.storage_size
+        # 图案种类数量有限，每个ID只取堆顶的几个元素，开销与棋盘大小无关
+        for pattern_id, free in self.free_by_id.items():
+            need = self.match_size - player.storage_counts.get(pattern_id, 0) % self.match_size
+            if need > len(free) or need > free_slots:
+                continue
+            top = self.top_patterns(pattern_id, need)
+            chosen = [pattern for pattern, _ in top]
+            score = sum(score for _, score in top)
+            yield (need, -score, -max(p.layer for p in chosen)), chosen, score
+
+    def ranked_hints(self, player):
+        """
+        列出所有可行的提示组合，按优先级排序。
+        优先需要点击次数最少的组合，其次是能露出更多图案的组合，最后是层级更高的组合。
+
+        :param player: Player 对象，用于读取暂存区中各ID的数量
+        :return: list，每项为 (需要点击的 Pattern 列表, 露出的图案数量)
+        """
+        hints = sorted(self.iter_hints(player), key=lambda h: h[0])
+        return [(chosen, score) for _, chosen, score in hints]
+
+    def best_hint(self, player):
+        """
+        获取最优的提示组合。
+
+        :param player: Player 对象
+        :return: list，需要点击的 Pattern 对象；没有可行组合时返回 None
+        """
+        best = min(self.iter_hints(player), key=lambda h: h[0], default=None)
+        return best[1] if best else None
@@ -4,12 +4,15 @@ import json
 import os
 
 class LeaderboardManager:
-    def __init__(self, file_path='leaderboard.json'):
+    def __init__(self, file_path='leaderboard.json', max_entries=10):
         """
         初始化排行榜管理器。
         :param file_path: 排行榜数据文件路径
+        :param max_entries: 排行榜保留的最多记录数
         """
         self.file_path = file_path
+        self.max_entries = max_entries
+        self.version = 0  # 数据版本号，每次排行榜变化时加一，界面据此判断是否需要重绘
         self.leaderboard = self.load_leaderboard()
 
     def load_leaderboard(self):
@@ -48,8 +51,9 @@ class LeaderboardManager:
         })
         # 按分数降序，时间升序排序
         self.leaderboard.sort(key=lambda x: (-x['score'], x['time']))
-        # 保持排行榜前10名
-        self.leaderboard = self.leaderboard[:10]
+        # 保持排行榜前 max_entries 名
+        self.leaderboard = self.leaderboard[:self.max_entries]
+        self.version += 1
         self.save_leaderboard()
         print(f"排行榜已更新: {self.leaderboard}")
 
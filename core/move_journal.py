@@ -0,0 +1,98 @@
+# core/move_journal.py
+
+from collections import deque
+
+
+class Move:
+    """
+    一步操作的增量记录：点击的图案、由此触发的消除以及分数变化。
+    """
+
+    __slots__ = ('pattern', 'matched', 'score_delta', 'was_game_over', 'was_victory')
+
+    def __init__(self, pattern, matched, score_delta, was_game_over, was_victory):
+        """
+        初始化操作记录。
+
+        :param pattern: Pattern 对象，本步点击的图案
+        :param matched: list，(分组位置, 图案列表) 二元组，本步凑齐后移出暂存区的图案
+        :param score_delta: int，本步的得分变化
+        :param was_game_over: bool，操作前的游戏结束标志
+        :param was_victory: bool，操作前的游戏胜利标志
+        """
+        self.pattern = pattern
+        self.matched = matched
+        self.score_delta = score_delta
+        self.was_game_over = was_game_over
+        self.was_victory = was_victory
+
+
+class MoveJournal:
+    """
+    可逆操作日志，使用定长环形缓冲区保存最近的操作，支持撤销与重做。
+    每条记录只包含操作的增量，内存占用与棋盘大小无关。
+    """
+
+    def __init__(self, max_depth=10):
+        """
+        初始化操作日志。
+
+        :param max_depth: int，最多可撤销的步数
+        """
+        self.max_depth = max_depth
+        self.undo_stack = deque(maxlen=max_depth)
+        self.redo_stack = deque(maxlen=max_depth)
+
+    def record(self, move):
+        """
+        记录一步新操作，新的操作会使重做记录失效。
+
+        :param move: Move 对象
+        """
+        self.undo_stack.append(move)
+        self.redo_stack.clear()
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def peek_undo(self):
+        """
+        查看最近一步可撤销的操作，不改变日志。
+
+        :return: Move 对象；没有可撤销的操作时返回 None
+        """
+        return self.undo_stack[-1] if self.undo_stack else None
+
+    def pop_undo(self):
+        """
+        取出最近一步操作用于撤销，并将其移入重做栈。
+
+        :return: Move 对象；没有可撤销的操作时返回 None
+        """
+        if not self.undo_stack:
+            return None
+        move = self.undo_stack.pop()
+        self.redo_stack.append(move)
+        return move
+
+    def pop_redo(self):
+        """
+        取出最近撤销的操作用于重做，并将其移回撤销栈。
+
+        :return: Move 对象；没有可重做的操作时返回 None
+        """
+        if not self.redo_stack:
+            return None
+        move = self.redo_stack.pop()
+        self.undo_stack.append(move)
+        return move
+
+    def clear(self):
+        """
+        清空所有记录。
+        """
+        self.undo_stack.clear()
+        self.redo_stack.clear()
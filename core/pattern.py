@@ -14,26 +14,47 @@ class Pattern:
         self.layer = 0                # 所在层级
         self.position = (0, 0)        # 位置坐标
         self.size = size              # 图案尺寸
-        self.is_cleared = False       # 是否已被消除
+        self._is_cleared = False      # 是否已被消除
+        self.index = -1               # 在 GameLogic.patterns 中的下标
+        self.cover_count = 0          # 覆盖该图案的未消除图案数量
+        self.coverage_graph = None    # 所属的遮挡关系图
 
-    def contains_point(self, pos):
+    @property
+    def is_cleared(self):
         """
-        检查鼠标位置是否在图案范围内。
-        :param pos: (x, y) 鼠标坐标
-        :return: bool
+        图案是否已被消除。
+        """
+        return self._is_cleared
+
+    @is_cleared.setter
+    def is_cleared(self, value):
+        """
+        设置消除状态，状态变化时通知遮挡关系图更新相邻图案。
+        """
+        value = bool(value)
+        if value == self._is_cleared:
+            return
+        self._is_cleared = value
+        if self.coverage_graph is not None:
+            self.coverage_graph.on_cleared_changed(self)
+
+    def get_bounds(self):
+        """
+        获取图案的矩形边界。
+
+        :return: (left, top, right, bottom)
         """
         x, y = self.position
         width, height = self.size
-        rect = pygame.Rect(x - width // 2, y - height // 2, width, height)
-        return rect.collidepoint(pos)
+        return (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
 
     def is_selectable(self):
         """
-        判断图案是否可被选择（未被覆盖）。
+        判断图案是否可被选择（未消除且未被覆盖）。
 
         :return: bool
         """
-        return not self.is_cleared
+        return not self._is_cleared and self.cover_count == 0
 
     def contains_point(self, point):
         """
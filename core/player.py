@@ -3,43 +3,94 @@
 class Player:
     """
     玩家类，管理玩家的选择和存储区。
+    暂存区按图案ID分组保存，相同的图案总是相邻排列，
+    并为每个ID维护计数，匹配检测和移除都无需扫描暂存区。
     """
 
-    def __init__(self, storage_limit):
+    def __init__(self, storage_limit, verbose=True, match_size=3):
         """
         初始化玩家。
 
         :param storage_limit: int，存储区的容量限制
+        :param verbose: bool，是否输出调试信息
+        :param match_size: int，消除所需的相同图案数量
         """
+        self.verbose = verbose
         self.storage_limit = storage_limit
-        self.selected_patterns = []  # 已选中的图案列表
-        self.storage = []            # 玩家暂存区
+        self.match_size = match_size
+        self.groups = {}             # 图案ID -> 暂存区中该ID的图案列表，按首次放入的顺序排列
+        self.storage_counts = {}     # 暂存区中各图案ID的数量
+        self.storage_size = 0        # 暂存区中的图案总数
+        self.pending_matches = []    # 已凑齐、等待移除的图案ID
         self.score = 0               # 玩家得分
 
+    @property
+    def storage(self):
+        """
+        玩家暂存区（按分组展开，相同ID相邻）。
+
+        :return: list，Pattern 对象
+        """
+        return [pattern for group in self.groups.values() for pattern in group]
+
+    @property
+    def selected_patterns(self):
+        """
+        已选中的图案列表，与暂存区一致。
+        """
+        return self.storage
+
     def select_pattern(self, pattern):
         """
-        选择一个图案并添加到暂存区。
+        选择一个图案并添加到暂存区，放在相同ID的图案之后。
 
         :param pattern: Pattern 对象，玩家选择的图案
         """
         if not self.is_storage_full():
-            self.selected_patterns.append(pattern)
-            self.storage.append(pattern)
-            print(f"选择了图案 ID: {pattern.id}")
+            group = self.groups.setdefault(pattern.id, [])
+            group.append(pattern)
+            self.storage_counts[pattern.id] = len(group)
+            self.storage_size += 1
+            if len(group) == self.match_size:
+                self.pending_matches.append(pattern.id)
+            if self.verbose:
+                print(f"选择了图案 ID: {pattern.id}")
         else:
-            print("暂存区已满，无法选择更多图案。")
+            if self.verbose:
+                print("暂存区已满，无法选择更多图案。")
 
     def check_for_match(self):
         """
-        检查暂存区是否有三个相同的图案。
+        检查暂存区是否有凑齐的相同图案。
 
         :return: bool，是否有匹配
         """
-        pattern_ids = [p.id for p in self.storage]
-        for pid in set(pattern_ids):
-            if pattern_ids.count(pid) >= 3:
-                return True
-        return False
+        return bool(self.pending_matches)
+
+    def pop_matches(self):
+        """
+        依次移除所有已凑齐的分组（可连续消除多组），并增加得分。
+
+        :return: list，(分组位置, 图案列表) 二元组，按移除顺序排列，用于撤销
+        """
+        removed = []
+        while self.pending_matches:
+            matched_id = self.pending_matches.pop(0)
+            group = self.groups.get(matched_id)
+            if group is None or len(group) < self.match_size:
+                continue
+            position = list(self.groups).index(matched_id)
+            matched_patterns = group[:self.match_size]
+            del group[:self.match_size]
+            if not group:
+                del self.groups[matched_id]
+            self.storage_counts[matched_id] = len(group)
+            self.storage_size -= len(matched_patterns)
+            self.score += 10  # 增加分数，可以根据需要调整
+            removed.append((position, matched_patterns))
+            if self.verbose:
+                print(f"消除了图案 ID: {matched_id}，得分增加到 {self.score}")
+        return removed
 
     def remove_matched_patterns(self):
         """
@@ -47,22 +98,7 @@ class Player:
 
         :return: list，已移除的图案对象
         """
-        pattern_ids = [p.id for p in self.storage]
-        matched_id = None
-        for pid in set(pattern_ids):
-            if pattern_ids.count(pid) >= 3:
-                matched_id = pid
-                break
-
-        if matched_id is not None:
-            matched_patterns = [p for p in self.storage if p.id == matched_id][:3]
-            for p in matched_patterns:
-                self.storage.remove(p)
-                self.selected_patterns.remove(p)
-            self.score += 10  # 增加分数，可以根据需要调整
-            print(f"消除了图案 ID: {matched_id}，得分增加到 {self.score}")
-            return matched_patterns
-        return []
+        return [pattern for _, patterns in self.pop_matches() for pattern in patterns]
 
     def is_storage_full(self):
         """
@@ -70,19 +106,56 @@ class Player:
 
         :return: bool，是否已满
         """
-        return len(self.storage) >= self.storage_limit
+        return self.storage_size >= self.storage_limit
+
+    def undo(self, pattern, matched=(), score_delta=0):
+        """
+        撤销一次图案选择：先按相反顺序把被消除的分组放回原位置，再移除本次选择的图案。
+
+        :param pattern: Pattern 对象，要撤销选择的图案
+        :param matched: 可迭代对象，pop_matches 返回的 (分组位置, 图案列表) 二元组
+        :param score_delta: int，本次选择带来的得分变化
+        :return: bool，表示是否成功撤销；失败时暂存区和分数保持不变
+        """
+        matched = list(matched)
+        # 先确认放回分组后该图案位于其分组末尾，再修改暂存区。
+        # 分组按相反顺序插入到已有分组之前，因此末尾是已有分组的末尾，或最后一个同ID被消除分组的末尾
+        group = self.groups.get(pattern.id)
+        restored = [patterns for _, patterns in matched if patterns[0].id == pattern.id]
+        last = group[-1] if group else (restored[-1][-1] if restored else None)
+        if last is not pattern:
+            if self.verbose:
+                print("没有可撤销的图案。")
+            return False
+
+        for position, patterns in reversed(matched):
+            self._restore_group(position, patterns)
+        self.score -= score_delta
+
+        group = self.groups[pattern.id]
+        group.pop()
+        if not group:
+            del self.groups[pattern.id]
+        self.storage_counts[pattern.id] = len(group)
+        self.storage_size -= 1
+        pattern.is_cleared = False  # 恢复图案为未消除状态
+        if self.verbose:
+            print(f"撤销图案 ID: {pattern.id}")
+        return True
 
-    def undo(self):
+    def _restore_group(self, position, patterns):
         """
-        撤销上一步的图案选择和操作。
+        把被消除的图案放回暂存区中原来的分组位置。
 
-        :return: bool，表示是否成功撤销
+        :param position: int，分组在暂存区中的位置
+        :param patterns: list，该分组被消除的图案
         """
-        if self.selected_patterns:
-            last_pattern = self.selected_patterns.pop()
-            last_pattern.is_cleared = False  # 恢复图案为未消除状态
-            print(f"撤销图案 ID: {last_pattern.id}")
-            return True
+        pattern_id = patterns[0].id
+        if pattern_id in self.groups:
+            self.groups[pattern_id][:0] = patterns
         else:
-            print("没有可撤销的图案。")
-            return False
\ No newline at end of file
+            items = list(self.groups.items())
+            items.insert(position, (pattern_id, list(patterns)))
+            self.groups = dict(items)
+        self.storage_counts[pattern_id] = len(self.groups[pattern_id])
+        self.storage_size += len(patterns)
@@ -0,0 +1,77 @@
+# core/policies.py
+
+class RandomPolicy:
+    """
+    随机策略：在所有可选图案中随机选择一个。
+    """
+
+    name = 'random'
+
+    def choose(self, game, rng):
+        """
+        选择下一步要点击的图案。
+
+        :param game: HeadlessGame 对象
+        :param rng: random.Random，随机数生成器
+        :return: int，图案下标；没有可选图案时返回 None
+        """
+        actions = game.legal_actions()
+        return rng.choice(actions) if actions else None
+
+
+class GreedyPolicy:
+    """
+    贪心策略：优先选择暂存区中已有较多相同图案的图案，
+    其次选择能露出更多图案、位于更高层的图案。
+    """
+
+    name = 'greedy'
+
+    def choose(self, game, rng):
+        game_logic = game.game_logic
+        storage_counts = game_logic.player.storage_counts
+        hint_index = game_logic.hint_index
+        best = None
+        best_key = None
+        for pattern_id, free in hint_index.free_by_id.items():
+            if not free:
+                continue
+            count = storage_counts.get(pattern_id, 0)
+            for pattern in free.values():
+                key = (count, hint_index.uncover_score(pattern), pattern.layer, rng.random())
+                if best_key is None or key > best_key:
+                    best, best_key = pattern, key
+        return best.index if best is not None else None
+
+
+class HintPolicy:
+    """
+    提示跟随策略：按提示索引给出的最优组合点击，没有可行组合时退回贪心策略。
+    与游戏内的提示道具不同，不受提示次数限制。
+    """
+
+    name = 'hint'
+
+    def __init__(self):
+        self.fallback = GreedyPolicy()
+
+    def choose(self, game, rng):
+        hint = game.game_logic.hint_index.best_hint(game.game_logic.player)
+        if hint:
+            return hint[0].index
+        return self.fallback.choose(game, rng)
+
+
+POLICIES = {policy.name: policy for policy in (RandomPolicy, GreedyPolicy, HintPolicy)}
+
+
+def get_policy(name):
+    """
+    按名称创建策略对象。
+
+    :param name: str，策略名称（'random', 'greedy', 'hint'）
+    :return: 策略对象
+    """
+    if name not in POLICIES:
+        raise ValueError(f"未知的策略：{name}，可选：{', '.join(POLICIES)}")
+    return POLICIES[name]()
@@ -0,0 +1,214 @@
+# core/replay.py
+
+import json
+import os
+import time
+
+# 文件格式：
+#   魔数 b'DDRP' | 版本(1字节) | varint 种子 | varint 屏幕宽 | varint 屏幕高
+#   | varint 配置长度 | 配置 JSON(UTF-8) | varint 操作数量 | 操作流
+#   | varint 最终得分 | 结果标志(1字节：bit0 游戏结束，bit1 胜利)
+# 每个操作是一个 varint：低 3 位为操作类型，选择操作的高位为图案下标。
+# 版本 1 的操作类型只占低 2 位（没有加时操作），读取时转换为当前编码。
+MAGIC = b'DDRP'
+VERSION = 2
+
+ACTION_SELECT = 0
+ACTION_HINT = 1
+ACTION_UNDO = 2
+ACTION_REDO = 3
+ACTION_TIME_BONUS = 4
+ACTION_TIMEOUT = 5  # 倒计时结束；回放不记录时间流逝，由该操作在相同位置结束对局
+
+ACTION_BITS = 3
+ACTION_MASK = (1 << ACTION_BITS) - 1
+
+
+def encode_varint(value, out):
+    """
+    以 LEB128 无符号变长整数编码写入字节数组。
+
+    :param value: int，非负整数
+    :param out: bytearray，输出缓冲区
+    """
+    if value < 0:
+        raise ValueError("varint 只支持非负整数。")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """
+    从字节串中解码一个 LEB128 无符号变长整数。
+
+    :param data: bytes，输入数据
+    :param offset: int，起始位置
+    :return: (值, 新的位置)
+    """
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("回放数据不完整。")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """
+    一局游戏的回放：种子、关卡配置、屏幕尺寸以及按顺序编码的操作流。
+    """
+
+    def __init__(self, seed, level_config, screen_size):
+        """
+        初始化回放。
+
+        :param seed: int，非负随机种子
+        :param level_config: dict，关卡配置
+        :param screen_size: (width, height)，生成棋盘时使用的屏幕尺寸
+        """
+        self.seed = seed
+        self.level_config = level_config
+        self.screen_size = tuple(screen_size)
+        self.actions = bytearray()  # 已编码的操作流
+        self.action_count = 0
+        self.final_score = 0
+        self.is_game_over = False
+        self.is_victory = False
+
+    def record(self, action, index=0):
+        """
+        追加一个操作。
+
+        :param action: int，操作类型（ACTION_*）
+        :param index: int，图案下标，仅选择操作使用
+        """
+        encode_varint((index << ACTION_BITS) | action, self.actions)
+        self.action_count += 1
+
+    def record_result(self, score, is_game_over, is_victory):
+        """
+        记录本局结果，回放时可用于校验。
+        """
+        self.final_score = score
+        self.is_game_over = is_game_over
+        self.is_victory = is_victory
+
+    def iter_actions(self):
+        """
+        依次解码操作流。
+
+        :return: 生成器，产生 (操作类型, 图案下标)
+        """
+        offset = 0
+        for _ in range(self.action_count):
+            value, offset = decode_varint(self.actions, offset)
+            yield value & ACTION_MASK, value >> ACTION_BITS
+
+    def to_bytes(self):
+        """
+        序列化为紧凑的二进制格式。
+
+        :return: bytes
+        """
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        encode_varint(self.seed, out)
+        encode_varint(self.screen_size[0], out)
+        encode_varint(self.screen_size[1], out)
+        config = json.dumps(self.level_config, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        encode_varint(len(config), out)
+        out += config
+        encode_varint(self.action_count, out)
+        out += self.actions
+        encode_varint(self.final_score, out)
+        out.append(int(self.is_game_over) | (int(self.is_victory) << 1))
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        从二进制数据解析回放。
+
+        :param data: bytes
+        :return: Replay
+        """
+        if data[:4] != MAGIC:
+            raise ValueError("不是有效的回放文件。")
+        version = data[4]
+        if version not in (1, VERSION):
+            raise ValueError(f"不支持的回放版本：{version}")
+        offset = 5
+        seed, offset = decode_varint(data, offset)
+        width, offset = decode_varint(data, offset)
+        height, offset = decode_varint(data, offset)
+        config_length, offset = decode_varint(data, offset)
+        level_config = json.loads(data[offset:offset + config_length].decode('utf-8'))
+        offset += config_length
+        replay = cls(seed, level_config, (width, height))
+        replay.action_count, offset = decode_varint(data, offset)
+        # 跳过操作流以定位结果字段
+        actions_start = offset
+        for _ in range(replay.action_count):
+            _, offset = decode_varint(data, offset)
+        replay.actions = bytearray(data[actions_start:offset])
+        if version == 1:
+            replay.actions = cls.upgrade_v1_actions(replay.actions, replay.action_count)
+        replay.final_score, offset = decode_varint(data, offset)
+        if offset >= len(data):
+            raise ValueError("回放数据不完整。")
+        flags = data[offset]
+        replay.is_game_over = bool(flags & 1)
+        replay.is_victory = bool(flags & 2)
+        return replay
+
+    @staticmethod
+    def upgrade_v1_actions(actions, count):
+        """
+        把版本 1（操作类型占 2 位）的操作流转换为当前编码。
+
+        :param actions: bytearray，版本 1 的操作流
+        :param count: int，操作数量
+        :return: bytearray
+        """
+        upgraded = bytearray()
+        offset = 0
+        for _ in range(count):
+            value, offset = decode_varint(actions, offset)
+            encode_varint(((value >> 2) << ACTION_BITS) | (value & 0b11), upgraded)
+        return upgraded
+
+    def save(self, directory):
+        """
+        保存回放到目录中，文件名包含时间和种子。
+
+        :param directory: str，保存目录
+        :return: str，回放文件路径
+        """
+        os.makedirs(directory, exist_ok=True)
+        base_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}"
+        path = os.path.join(directory, f"{base_name}.ddr")
+        suffix = 1
+        while os.path.exists(path):  # 同一秒内同一种子的多局回放不互相覆盖
+            path = os.path.join(directory, f"{base_name}-{suffix}.ddr")
+            suffix += 1
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        从文件加载回放。
+
+        :param path: str，回放文件路径
+        :return: Replay
+        """
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
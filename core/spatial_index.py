@@ -0,0 +1,122 @@
+# core/spatial_index.py
+
+import math
+
+
+class SpatialGrid:
+    """
+    均匀网格空间索引，按图案矩形把图案分桶，
+    使点查询和重叠查询只需检查附近的图案。
+    """
+
+    def __init__(self, cell_size):
+        """
+        初始化空间索引。
+
+        :param cell_size: float，网格单元边长，一般取图案宽度
+        """
+        self.cell_size = max(float(cell_size), 1.0)
+        self.cells = {}        # (cx, cy) -> 该单元内的图案列表
+        self.pattern_cells = {}  # id(pattern) -> 图案所在的单元列表
+
+    @classmethod
+    def build(cls, patterns, cell_size):
+        """
+        根据图案列表构建空间索引。
+
+        :param patterns: list，Pattern 对象列表
+        :param cell_size: float，网格单元边长
+        :return: SpatialGrid
+        """
+        grid = cls(cell_size)
+        for pattern in patterns:
+            grid.insert(pattern)
+        return grid
+
+    def _cell_range(self, left, top, right, bottom):
+        """
+        计算矩形覆盖的网格单元范围。
+
+        :return: (cx0, cy0, cx1, cy1)，包含两端
+        """
+        size = self.cell_size
+        return (math.floor(left / size), math.floor(top / size),
+                math.floor(right / size), math.floor(bottom / size))
+
+    def insert(self, pattern):
+        """
+        将图案加入索引。图案位置改变后需先移除再重新加入。
+
+        :param pattern: Pattern 对象
+        """
+        bounds = pattern.get_bounds()
+        # 桶中直接保存边界，查询时无需再从图案属性计算
+        entry = bounds + (pattern,)
+        cx0, cy0, cx1, cy1 = self._cell_range(*bounds)
+        keys = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), []).append(entry)
+                keys.append((cx, cy))
+        self.pattern_cells[id(pattern)] = (entry, keys)
+
+    def remove(self, pattern):
+        """
+        将图案从索引中移除。
+
+        :param pattern: Pattern 对象
+        """
+        entry, keys = self.pattern_cells.pop(id(pattern), (None, ()))
+        for key in keys:
+            bucket = self.cells.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(entry)
+            if not bucket:
+                del self.cells[key]
+
+    def query_point(self, point):
+        """
+        查询包含指定点的所有图案。
+
+        :param point: (x, y) 坐标
+        :return: list，包含该点的 Pattern 对象
+        """
+        px, py = point
+        key = (math.floor(px / self.cell_size), math.floor(py / self.cell_size))
+        return [
+            pattern for left, top, right, bottom, pattern in self.cells.get(key, ())
+            if left <= px <= right and top <= py <= bottom
+        ]
+
+    def query_rect(self, left, top, right, bottom):
+        """
+        查询与指定矩形重叠（边界相接不算重叠）的所有图案。
+
+        :return: list，去重后的 Pattern 对象
+        """
+        cx0, cy0, cx1, cy1 = self._cell_range(left, top, right, bottom)
+        single_cell = cx0 == cx1 and cy0 == cy1
+        seen = set()
+        result = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for l2, t2, r2, b2, pattern in self.cells.get((cx, cy), ()):
+                    if right <= l2 or r2 <= left or bottom <= t2 or b2 <= top:
+                        continue
+                    # 跨多个单元的图案会重复出现，只在命中时去重
+                    if not single_cell:
+                        if id(pattern) in seen:
+                            continue
+                        seen.add(id(pattern))
+                    result.append(pattern)
+        return result
+
+    def query_overlaps(self, pattern):
+        """
+        查询与指定图案重叠的所有其他图案。
+
+        :param pattern: Pattern 对象
+        :return: list，与其重叠的 Pattern 对象
+        """
+        return [p for p in self.query_rect(*pattern.get_bounds()) if p is not pattern]
@@ -1,22 +1,50 @@
 # core/timer.py
 
-import time
+import math
+
+from core.clock import MonotonicClock
 
 class Timer:
     """
     倒计时器类，管理游戏时间。
+    时间来源可替换：交互时使用真实时钟，模拟和回放时使用可瞬间推进的虚拟时钟。
     """
 
-    def __init__(self, total_time):
-        self.total_time = total_time  # 总时间限制
-        self.start_time = time.time()  # 记录开始时间
+    def __init__(self, total_time, clock=None, tick=None, verbose=True):
+        """
+        初始化倒计时器。
+
+        :param total_time: float，总时间限制（秒）
+        :param clock: 时钟对象，需实现 now()，默认使用 MonotonicClock
+        :param tick: float，固定时间步长；设置后剩余时间只按整数个步长减少
+        :param verbose: bool，是否输出调试信息
+        """
+        self.verbose = verbose
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.tick = tick
+        self.total_time = total_time  # 总时间限制，加时道具会增加该值
+        self.start_time = self.clock.now()  # 记录开始时间
+        self.paused_at = None  # 暂停开始的时间，未暂停时为 None
+        self.paused_duration = 0.0  # 累计暂停的时长
         self.remaining_time = total_time
 
+    def elapsed(self):
+        """
+        返回已流逝的有效时间（不含暂停时长）。
+
+        :return: float，秒
+        """
+        now = self.paused_at if self.paused_at is not None else self.clock.now()
+        return now - self.start_time - self.paused_duration
+
     def update(self):
         """
         更新剩余时间，每帧调用一次。
         """
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = self.elapsed()
+        if self.tick:
+            # 固定步长：只计算已经完整走过的步数，模拟结果与帧率无关
+            elapsed_time = math.floor(elapsed_time / self.tick) * self.tick
         self.remaining_time = self.total_time - elapsed_time
 
     def time_up(self):
@@ -29,7 +57,28 @@ class Timer:
         """
         返回已用的时间。
         """
-        return time.time() - self.start_time
+        return self.elapsed()
+
+    def pause(self):
+        """
+        暂停计时。
+        """
+        if self.paused_at is None:
+            self.paused_at = self.clock.now()
+
+    def resume(self):
+        """
+        恢复计时，暂停期间的时间不计入已用时间。
+        """
+        if self.paused_at is not None:
+            self.paused_duration += self.clock.now() - self.paused_at
+            self.paused_at = None
+
+    def is_paused(self):
+        """
+        检查计时器是否处于暂停状态。
+        """
+        return self.paused_at is not None
 
     def add_time(self, seconds):
         """
@@ -37,5 +86,7 @@ class Timer:
 
         :param seconds: int，增加的秒数
         """
-        self.time_limit += seconds
-        print(f"已增加 {seconds} 秒，新的总时长为 {self.time_limit} 秒。")
+        self.total_time += seconds
+        self.update()
+        if self.verbose:
+            print(f"已增加 {seconds} 秒，新的总时长为 {self.total_time} 秒。")
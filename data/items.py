@@ -5,18 +5,26 @@ class ItemManager:
     道具管理类，实现道具的功能和使用逻辑。
     """
 
-    def __init__(self, hint_limit, undo_limit):
+    def __init__(self, hint_limit, undo_limit, verbose=True, time_bonus_limit=0, time_bonus_seconds=30):
         """
         初始化道具管理器。
 
         :param hint_limit: int，提示道具的使用次数限制
         :param undo_limit: int，撤销道具的使用次数限制
+        :param verbose: bool，是否输出调试信息
+        :param time_bonus_limit: int，加时道具的使用次数限制
+        :param time_bonus_seconds: int，每次加时增加的秒数
         """
+        self.verbose = verbose
         self.hint_limit = hint_limit
         self.undo_limit = undo_limit
+        self.time_bonus_limit = time_bonus_limit
+        self.time_bonus_seconds = time_bonus_seconds
         self.hint_used = 0
         self.undo_used = 0
-        print(f"ItemManager initialized with hint_limit={hint_limit}, undo_limit={undo_limit}")
+        self.time_bonus_used = 0
+        if self.verbose:
+            print(f"ItemManager initialized with hint_limit={hint_limit}, undo_limit={undo_limit}")
 
     def can_use_hint(self):
         """
@@ -24,7 +32,8 @@ class ItemManager:
         :return: bool
         """
         can_use = self.hint_used < self.hint_limit
-        print(f"Checking can_use_hint: {self.hint_used} / {self.hint_limit} -> {can_use}")
+        if self.verbose:
+            print(f"Checking can_use_hint: {self.hint_used} / {self.hint_limit} -> {can_use}")
         return can_use
 
     def use_hint(self, game_logic):
@@ -38,12 +47,15 @@ class ItemManager:
             hint = game_logic.find_hint()
             if hint:
                 self.hint_used += 1
-                print(f"使用提示道具，剩余次数：{self.hint_limit - self.hint_used}")
+                if self.verbose:
+                    print(f"使用提示道具，剩余次数：{self.hint_limit - self.hint_used}")
                 return hint
             else:
-                print("没有可用的提示。")
+                if self.verbose:
+                    print("没有可用的提示。")
         else:
-            print("提示道具已用完。")
+            if self.verbose:
+                print("提示道具已用完。")
         return None
 
     def can_use_undo(self):
@@ -52,26 +64,54 @@ class ItemManager:
         :return: bool
         """
         can_use = self.undo_used < self.undo_limit
-        print(f"Checking can_use_undo: {self.undo_used} / {self.undo_limit} -> {can_use}")
+        if self.verbose:
+            print(f"Checking can_use_undo: {self.undo_used} / {self.undo_limit} -> {can_use}")
         return can_use
 
-    def use_undo(self, player):
+    def use_undo(self, game_logic):
         """
         使用撤销道具，撤销上一次的图案选择。
 
-        :param player: Player 对象，玩家实例
+        :param game_logic: GameLogic 对象，游戏逻辑实例
         :return: bool，表示是否成功使用撤销道具
         """
         if self.can_use_undo():
-            success = player.undo()
+            success = game_logic.undo_move()
             if success:
                 self.undo_used += 1
-                print(f"使用撤销道具，剩余次数：{self.undo_limit - self.undo_used}")
+                if self.verbose:
+                    print(f"使用撤销道具，剩余次数：{self.undo_limit - self.undo_used}")
                 return True
             else:
-                print("无法撤销。")
+                if self.verbose:
+                    print("无法撤销。")
         else:
-            print("撤销道具已用完。")
+            if self.verbose:
+                print("撤销道具已用完。")
+        return False
+
+    def can_use_time_bonus(self):
+        """
+        检查是否可以使用加时道具。
+        :return: bool
+        """
+        return self.time_bonus_used < self.time_bonus_limit
+
+    def use_time_bonus(self, game_logic):
+        """
+        使用加时道具，增加倒计时时间。
+
+        :param game_logic: GameLogic 对象，游戏逻辑实例
+        :return: bool，表示是否成功使用加时道具
+        """
+        if self.can_use_time_bonus() and not game_logic.is_game_over:
+            game_logic.timer.add_time(self.time_bonus_seconds)
+            self.time_bonus_used += 1
+            if self.verbose:
+                print(f"使用加时道具，剩余次数：{self.time_bonus_limit - self.time_bonus_used}")
+            return True
+        if self.verbose:
+            print("加时道具已用完。")
         return False
 
     def reset_items(self):
@@ -80,4 +120,6 @@ class ItemManager:
         """
         self.hint_used = 0
         self.undo_used = 0
-        print("ItemManager 的道具使用次数已重置。")
+        self.time_bonus_used = 0
+        if self.verbose:
+            print("ItemManager 的道具使用次数已重置。")
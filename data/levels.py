@@ -27,7 +27,8 @@ class LevelManager:
                 'time_limit': 600,     # 增加时间限制
                 'hint_limit': 5,       # 增加提示次数
                 'undo_limit': 5,       # 增加撤销次数
-                'storage_limit': 8     # 增加暂存区容量
+                'storage_limit': 8,      # 增加暂存区容量
+                'generator': 'solvable'  # 生成保证可解的棋盘
             },
             'hard': {
                 'pattern_types': 7,
@@ -36,7 +37,8 @@ class LevelManager:
                 'time_limit': 400,
                 'hint_limit': 3,
                 'undo_limit': 3,
-                'storage_limit': 7
+                'storage_limit': 7,
+                'generator': 'solvable'  # 生成保证可解的棋盘
             },
             'hell': {
                 'pattern_types': 10,
@@ -45,7 +47,8 @@ class LevelManager:
                 'time_limit': 300,
                 'hint_limit': 1,
                 'undo_limit': 1,
-                'storage_limit': 7
+                'storage_limit': 7,
+                'generator': 'solvable'  # 生成保证可解的棋盘
             }
         }
         return levels
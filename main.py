@@ -9,7 +9,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from ui.ui_manager import UIManager
 
 def main():
-    ui_manager = UIManager()
+    # 使用 --profile 启用帧分析器（F3 显示统计浮层，F4 导出追踪文件）
+    ui_manager = UIManager(profile=True if '--profile' in sys.argv[1:] else None)
     ui_manager.run()
 
 if __name__ == "__main__":
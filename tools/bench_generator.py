@@ -0,0 +1,96 @@
+# tools/bench_generator.py
+"""
+可解棋盘生成器吞吐量基准测试。
+
+用法：
+    python -m tools.bench_generator [--duration 2.0] [--scales 5 20 50] [--json]
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+
+from core.board_generator import SolvableBoardGenerator
+from data.levels import LevelManager
+
+SCREEN_WIDTH = 500
+SCREEN_HEIGHT = 780
+
+
+def build_configs(scales):
+    """
+    构建基准测试的关卡配置：内置的 easy/hard/hell，以及按倍数放大图案数量的合成配置。
+    合成配置同时按面积放大摆放范围，使图案密度与原配置一致。
+
+    :param scales: list，合成配置的放大倍数
+    :return: dict，名称 -> (关卡配置, 放大倍数)
+    """
+    levels = LevelManager().load_levels()
+    configs = {mode: (config, 1) for mode, config in levels.items()}
+    for mode, config in levels.items():
+        for scale in scales:
+            scaled = dict(config)
+            scaled['total_patterns'] = config['total_patterns'] * scale
+            configs[f"{mode}_x{scale}"] = (scaled, scale)
+    return configs
+
+
+def bench_config(config, scale, duration, seed):
+    """
+    在给定时间内反复生成棋盘，统计每秒生成的棋盘数量。
+
+    :param config: dict，关卡配置
+    :param scale: int，摆放面积的放大倍数
+    :param duration: float，测试时长（秒）
+    :param seed: int，随机种子
+    :return: dict，测试结果
+    """
+    rng = random.Random(seed)
+    pattern_size = (int(SCREEN_WIDTH * 0.2), int(SCREEN_WIDTH * 0.2))
+    generator = SolvableBoardGenerator(
+        config,
+        pattern_size,
+        (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2),
+        pattern_size[0] * 2 * math.sqrt(scale),
+        rng=rng
+    )
+    boards = 0
+    tiles = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration or boards == 0:
+        patterns, _, _ = generator.generate()
+        boards += 1
+        tiles += len(patterns)
+        elapsed = time.perf_counter() - start
+    return {
+        'boards': boards,
+        'tiles_per_board': tiles // boards,
+        'seconds': round(elapsed, 3),
+        'boards_per_second': round(boards / elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="可解棋盘生成器吞吐量基准测试")
+    parser.add_argument('--duration', type=float, default=2.0, help="每个配置的测试时长（秒）")
+    parser.add_argument('--scales', type=int, nargs='*', default=[5, 20, 50], help="合成配置的放大倍数")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (config, scale) in build_configs(args.scales).items():
+        results[name] = bench_config(config, scale, args.duration, args.seed)
+        if not args.json:
+            result = results[name]
+            print(f"{name:<12} {result['tiles_per_board']:>6} 个图案  "
+                  f"{result['boards_per_second']:>10.2f} 局/秒")
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
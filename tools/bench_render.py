@@ -0,0 +1,340 @@
+# tools/bench_render.py
+"""
+界面渲染基准测试：使用 SDL 的 dummy 视频驱动在无窗口环境中运行 UIManager，
+按脚本注入输入（悬停扫描、点击、提示、撤销），统计帧率、帧耗时分位数和每帧内存分配。
+覆盖菜单场景、内置的 easy/hard/hell 以及图案数量放大若干倍的合成配置，
+输出 JSON 便于比较渲染改动前后的结果。
+
+用法：
+    python -m tools.bench_render [--scales 5 20 50] [--max-moves 150] [--no-alloc] [--json] [--output result.json]
+"""
+
+import os
+
+# 必须在 pygame 初始化显示之前设置
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # 导入 pygame 时的欢迎信息会混入 JSON 输出
+
+import argparse
+import contextlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from tools.bench_generator import build_configs
+from ui.profiler import FrameProfiler
+from ui.ui_manager import UIManager
+
+MENU_SCENES = ('main_menu', 'mode_selection', 'leaderboard')
+
+
+def motion(pos):
+    """
+    一次鼠标移动。
+
+    :return: list，一帧的事件列表
+    """
+    return [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))]
+
+
+def click(pos):
+    """
+    一次左键点击，按下和抬起分别在两帧中发生。
+
+    :return: list，两帧的事件列表
+    """
+    return [
+        [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)],
+        [pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)],
+    ]
+
+
+def script_menu(ui, scene, frames):
+    """
+    菜单场景的输入脚本：鼠标按蛇形路线扫过整个屏幕，经过所有按钮；
+    每 60 帧触发一次整屏重绘，排行榜界面同时上下滚动。
+
+    :param ui: UIManager 对象
+    :param scene: str，场景名称
+    :param frames: int，帧数
+    :return: 生成器，每次产生一帧的事件列表
+    """
+    ui.current_scene = scene
+    columns = 20
+    rows = max(1, frames // columns)
+    for frame in range(frames):
+        row, column = divmod(frame, columns)
+        if row % 2:
+            column = columns - 1 - column
+        pos = (int((column + 0.5) * ui.screen_width / columns),
+               int(((row % rows) + 0.5) * ui.screen_height / rows))
+        events = motion(pos)
+        if frame % 60 == 59:
+            events.append(pygame.event.Event(pygame.VIDEOEXPOSE))
+        if scene == "leaderboard" and frame % 10 == 0:
+            direction = -1 if (frame // 100) % 2 == 0 else 1
+            events.append(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=direction, flipped=False))
+        yield events
+
+
+def visible_point(game_logic, pattern, samples=5):
+    """
+    找到图案上点击时会选中该图案的位置：优先使用中心，
+    中心被同层后绘制的图案挡住时，在图案范围内按网格取样。
+
+    :param game_logic: GameLogic 对象
+    :param pattern: Pattern 对象
+    :param samples: int，每个方向的取样数量
+    :return: (x, y)
+    """
+    # 直接调用类上的方法，不计入分析器对该方法的调用统计
+    hit_test = type(game_logic).get_pattern_at_position
+    center = (int(pattern.position[0]), int(pattern.position[1]))
+    if hit_test(game_logic, center) is pattern:
+        return center
+    left, top, right, bottom = pattern.get_bounds()
+    for i in range(samples):
+        for j in range(samples):
+            point = (int(left + (right - left) * (i + 0.5) / samples),
+                     int(top + (bottom - top) * (j + 0.5) / samples))
+            if hit_test(game_logic, point) is pattern:
+                return point
+    return center
+
+
+def script_game(ui, hover_steps, max_moves, hint_every, undo_every):
+    """
+    游戏场景的输入脚本：按见证解依次把鼠标移到图案上再点击，
+    定期使用提示，定期撤销后重新点击同一个图案。
+    不执行见证解的最后一步，避免本局结束（写排行榜、保存回放和上传分数）。
+
+    :param ui: UIManager 对象，已经开始游戏
+    :param hover_steps: int，每次移动鼠标经过的帧数
+    :param max_moves: int，最多执行的步数
+    :param hint_every: int，每隔多少步使用一次提示，0 表示不使用
+    :param undo_every: int，每隔多少步撤销一次，0 表示不撤销
+    :return: 生成器，每次产生一帧的事件列表
+    """
+    game_logic = ui.game_logic
+    last = (ui.screen_width // 2, ui.screen_height // 2)
+    for move, index in enumerate(game_logic.solution[:-1]):
+        if move >= max_moves or ui.current_scene != "game":
+            return
+        pattern = game_logic.patterns[index]
+        target = visible_point(game_logic, pattern)
+        for step in range(1, hover_steps + 1):
+            yield motion((last[0] + (target[0] - last[0]) * step // hover_steps,
+                          last[1] + (target[1] - last[1]) * step // hover_steps))
+        last = target
+
+        if hint_every and move % hint_every == hint_every - 1 and game_logic.item_manager.can_use_hint():
+            yield from click(ui.hint_button.rect.center)
+            yield motion(target)
+        yield from click(target)
+        if undo_every and move % undo_every == undo_every - 1 and game_logic.item_manager.can_use_undo():
+            yield from click(ui.undo_button.rect.center)
+            yield motion(target)
+            yield from click(target)
+
+
+def create_ui(window, profile=True):
+    """
+    创建界面管理器，启用帧分析器时保留全部帧的数据。
+
+    :param window: int，分析器保留的帧数
+    :param profile: bool，是否启用帧分析器
+    :return: UIManager 对象
+    """
+    ui = UIManager(profile=profile)
+    ui.profiler.window = window
+    # 资源在后台加载，测试前全部加载完成，只测量稳定状态的渲染
+    ui.assets.ensure_loaded(ui.assets.manifest)
+    ui.poll_assets()
+    return ui
+
+
+def build_scenarios(args):
+    """
+    构建基准测试场景。
+
+    :return: dict，名称 -> (场景, 关卡配置)
+    """
+    scenarios = {scene: (scene, None) for scene in MENU_SCENES}
+    for name, (config, _) in build_configs(args.scales).items():
+        scenarios[name] = ("game", config)
+    return scenarios
+
+
+def play_scenario(name, scene, config, args, frame_hook=None):
+    """
+    在新的界面管理器中运行一个场景的输入脚本。
+
+    :param frame_hook: 可调用对象，每帧前后分别以 'begin'/'end' 调用，用于统计内存分配；
+                       给出时不启用帧分析器，避免分析器自身的分配计入结果
+    :return: (UIManager 对象, 帧数)
+    """
+    ui = create_ui(args.max_frames, profile=frame_hook is None)
+    if scene == "game":
+        ui.level_manager.levels[name] = config
+        ui.selected_mode = name
+        random.seed(args.seed)  # GameLogic 从全局随机数生成器取得种子，保证两轮运行的棋盘相同
+        ui.start_game()
+        script = script_game(ui, args.hover_steps, args.max_moves, args.hint_every, args.undo_every)
+    else:
+        script = script_menu(ui, scene, args.menu_frames)
+
+    frames = 0
+    for events in script:
+        if frames >= args.max_frames:
+            break
+        if frame_hook:
+            frame_hook('begin')
+        # 与 UIManager.run 的一帧相同，但不限制帧率也不等待输入
+        ui.profiler.begin_frame()
+        with ui.profiler.phase('events'):
+            ui.handle_events(events)
+        with ui.profiler.phase('update'):
+            ui.update()
+        ui.present()
+        ui.profiler.end_frame()
+        if frame_hook:
+            frame_hook('end')
+        frames += 1
+    ui.profiler.restore()
+    return ui, frames
+
+
+def summarize_times(values):
+    """
+    汇总帧耗时（毫秒）。
+    """
+    values = sorted(values)
+    total = sum(values)
+    return {
+        'mean': round(total / len(values), 4) if values else 0.0,
+        'p50': round(FrameProfiler.percentile(values, 0.50), 4),
+        'p95': round(FrameProfiler.percentile(values, 0.95), 4),
+        'p99': round(FrameProfiler.percentile(values, 0.99), 4),
+        'max': round(values[-1], 4) if values else 0.0,
+    }
+
+
+def measure_allocations(name, scene, config, args):
+    """
+    重新运行同一场景并用 tracemalloc 统计每帧的 Python 内存分配。
+    内存跟踪会拖慢执行，因此与计时分开运行。
+
+    :return: dict
+    """
+    peaks = []
+    blocks = []
+    state = {}
+
+    def frame_hook(stage):
+        if stage == 'begin':
+            tracemalloc.reset_peak()
+            state['current'] = tracemalloc.get_traced_memory()[0]
+            state['blocks'] = sys.getallocatedblocks()
+        else:
+            peaks.append(tracemalloc.get_traced_memory()[1] - state['current'])
+            blocks.append(sys.getallocatedblocks() - state['blocks'])
+
+    tracemalloc.start()
+    try:
+        play_scenario(name, scene, config, args, frame_hook)
+    finally:
+        tracemalloc.stop()
+    peaks.sort()
+    frames = len(peaks)
+    return {
+        'kib_per_frame_mean': round(sum(peaks) / frames / 1024, 3) if frames else 0.0,
+        'kib_per_frame_p95': round(FrameProfiler.percentile(peaks, 0.95) / 1024, 3),
+        'kib_per_frame_max': round(peaks[-1] / 1024, 3) if frames else 0.0,
+        'net_blocks_per_frame': round(sum(blocks) / frames, 3) if frames else 0.0,
+    }
+
+
+def bench_scenario(name, scene, config, args):
+    """
+    运行一个场景并汇总结果。
+
+    :return: dict
+    """
+    ui, frames = play_scenario(name, scene, config, args)
+    frame_times = list(ui.profiler.samples.get('frame', ()))
+    stats = ui.profiler.get_stats()
+    total_seconds = sum(frame_times) / 1000
+    result = {
+        'scene': scene,
+        'tiles': len(ui.game_logic.patterns) if ui.game_logic else 0,
+        'frames': frames,
+        'fps': round(frames / total_seconds, 2) if total_seconds else 0.0,
+        'frame_ms': summarize_times(frame_times),
+        'phases_ms': {
+            phase: {key: round(value, 4) for key, value in values.items()}
+            for phase, values in stats['phases'].items() if phase != 'frame'
+        },
+        'counters_per_frame': {key: round(value, 3) for key, value in stats['counters'].items()},
+    }
+    if args.alloc:
+        result['alloc'] = measure_allocations(name, scene, config, args)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="界面渲染基准测试（SDL dummy 驱动）")
+    parser.add_argument('--scales', type=int, nargs='*', default=[5, 20, 50], help="合成配置的放大倍数")
+    parser.add_argument('--scenarios', nargs='*', default=None, help="只运行指定的场景，例如 main_menu hell hell_x20")
+    parser.add_argument('--menu-frames', type=int, default=600, help="每个菜单场景的帧数")
+    parser.add_argument('--max-moves', type=int, default=150, help="每局最多执行的步数")
+    parser.add_argument('--max-frames', type=int, default=5000, help="每个场景最多运行的帧数")
+    parser.add_argument('--hover-steps', type=int, default=6, help="每次移动鼠标经过的帧数")
+    parser.add_argument('--hint-every', type=int, default=10, help="每隔多少步使用一次提示，0 表示不使用")
+    parser.add_argument('--undo-every', type=int, default=7, help="每隔多少步撤销一次，0 表示不撤销")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子")
+    parser.add_argument('--no-alloc', dest='alloc', action='store_false', help="不统计内存分配")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    parser.add_argument('--output', default=None, help="把 JSON 结果写入文件")
+    args = parser.parse_args()
+
+    scenarios = build_scenarios(args)
+    if args.scenarios:
+        scenarios = {name: scenarios[name] for name in args.scenarios}
+
+    results = {}
+    start = time.perf_counter()
+    for name, (scene, config) in scenarios.items():
+        # 游戏逻辑和资源加载会输出大量调试信息，测试期间丢弃
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results[name] = bench_scenario(name, scene, config, args)
+        if not args.json:
+            result = results[name]
+            alloc = f"{result['alloc']['kib_per_frame_mean']:>9.1f} KiB/帧" if 'alloc' in result else ""
+            print(f"{name:<16}{result['tiles']:>6} 个图案 {result['frames']:>6} 帧 "
+                  f"{result['fps']:>9.1f} 帧/秒  p50 {result['frame_ms']['p50']:>7.3f} 毫秒  "
+                  f"p99 {result['frame_ms']['p99']:>7.3f} 毫秒 {alloc}")
+    report = {
+        'results': results,
+        '_meta': {
+            'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+            'pygame': pygame.version.ver,
+            'seconds': round(time.perf_counter() - start, 3),
+            'args': vars(args),
+        },
+    }
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=4)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# tools/difficulty_estimator.py
+"""
+关卡难度蒙特卡洛估计：对每个关卡配置用指定策略并行模拟 N 局游戏，
+统计胜率、平均步数、暂存区满导致的失败和超时次数。
+
+用法：
+    python -m tools.difficulty_estimator --games 10000 --policies random greedy hint [--workers 8] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.engine import HeadlessGame
+from core.policies import POLICIES, get_policy
+from data.levels import LevelManager
+
+OUTCOMES = ('victory', 'storage_full', 'timeout', 'stuck')
+
+
+def play_game(level_config, seed, policy, seconds_per_move):
+    """
+    用指定策略模拟一局游戏。
+
+    :param level_config: dict，关卡配置
+    :param seed: int，随机种子（同时决定棋盘和策略的随机选择）
+    :param policy: 策略对象
+    :param seconds_per_move: float，每步消耗的模拟时间，在虚拟时钟上推进，用于判断超时
+    :return: (结局, 步数)
+    """
+    game = HeadlessGame(level_config, seed=seed)
+    rng = random.Random(seed)
+    while not game.is_over:
+        if game.advance_time(seconds_per_move):
+            return 'timeout', game.move_count
+        index = policy.choose(game, rng)
+        if index is None:
+            return 'stuck', game.move_count
+        game.select(index)
+    if game.is_victory:
+        return 'victory', game.move_count
+    return 'storage_full', game.move_count
+
+
+def run_batch(mode, level_config, policy_name, seeds, seconds_per_move):
+    """
+    在工作进程中模拟一批游戏，返回汇总结果以减少进程间通信。
+
+    :return: dict，各结局的次数与总步数
+    """
+    policy = get_policy(policy_name)
+    totals = {outcome: 0 for outcome in OUTCOMES}
+    totals['moves'] = 0
+    for seed in seeds:
+        outcome, moves = play_game(level_config, seed, policy, seconds_per_move)
+        totals[outcome] += 1
+        totals['moves'] += moves
+    return mode, policy_name, totals
+
+
+def summarize(totals, games):
+    """
+    把次数汇总转换为报告指标。
+
+    :param totals: dict，各结局次数与总步数
+    :param games: int，总局数
+    :return: dict
+    """
+    return {
+        'games': games,
+        'win_rate': round(totals['victory'] / games, 4) if games else 0.0,
+        'avg_moves': round(totals['moves'] / games, 2) if games else 0.0,
+        'victories': totals['victory'],
+        'storage_full_losses': totals['storage_full'],
+        'timeouts': totals['timeout'],
+        'stuck': totals['stuck'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="关卡难度蒙特卡洛估计")
+    parser.add_argument('--games', type=int, default=1000, help="每个配置、每个策略模拟的局数")
+    parser.add_argument('--modes', nargs='*', default=None, help="要评估的模式，默认全部")
+    parser.add_argument('--policies', nargs='*', default=list(POLICIES), choices=list(POLICIES),
+                        help="使用的策略")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="工作进程数量")
+    parser.add_argument('--batch-size', type=int, default=200, help="每个任务包含的局数")
+    parser.add_argument('--seconds-per-move', type=float, default=2.0, help="每步消耗的模拟时间（秒）")
+    parser.add_argument('--seed', type=int, default=0, help="起始随机种子")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args()
+
+    levels = LevelManager().load_levels()
+    modes = args.modes or list(levels)
+
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = []
+        for mode in modes:
+            for policy_name in args.policies:
+                results[(mode, policy_name)] = {outcome: 0 for outcome in OUTCOMES}
+                results[(mode, policy_name)]['moves'] = 0
+                for batch_start in range(0, args.games, args.batch_size):
+                    seeds = range(args.seed + batch_start,
+                                  args.seed + min(batch_start + args.batch_size, args.games))
+                    futures.append(executor.submit(
+                        run_batch, mode, levels[mode], policy_name, seeds, args.seconds_per_move
+                    ))
+        for future in futures:
+            mode, policy_name, totals = future.result()
+            for key, value in totals.items():
+                results[(mode, policy_name)][key] += value
+    elapsed = time.perf_counter() - start
+
+    report = {
+        mode: {policy_name: summarize(results[(mode, policy_name)], args.games) for policy_name in args.policies}
+        for mode in modes
+    }
+    total_games = args.games * len(modes) * len(args.policies)
+    if args.json:
+        report['_meta'] = {
+            'total_games': total_games,
+            'seconds': round(elapsed, 3),
+            'games_per_second': round(total_games / elapsed, 2),
+            'workers': args.workers,
+        }
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+        return
+
+    print(f"{'模式':<6}{'策略':<8}{'胜率':>8}{'平均步数':>10}{'暂存区满':>10}{'超时':>8}")
+    for mode, by_policy in report.items():
+        for policy_name, summary in by_policy.items():
+            print(f"{mode:<8}{policy_name:<10}{summary['win_rate']:>8.2%}{summary['avg_moves']:>12.2f}"
+                  f"{summary['storage_full_losses']:>12}{summary['timeouts']:>10}")
+    print(f"共 {total_games} 局，用时 {elapsed:.2f} 秒（{total_games / elapsed:.0f} 局/秒，{args.workers} 个进程）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# tools/replay_runner.py
+"""
+回放执行器：以无界面模式全速重新执行回放文件，校验结果并统计耗时。
+
+用法：
+    python -m tools.replay_runner replays/ [more.ddr ...] [--repeat 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from core.engine import HeadlessGame
+from core.replay import Replay
+
+
+def collect_paths(paths):
+    """
+    展开命令行给出的文件和目录，得到所有回放文件路径。
+
+    :param paths: list，文件或目录路径
+    :return: list，按名称排序的回放文件路径
+    """
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.ddr'):
+                    result.append(os.path.join(path, name))
+        else:
+            result.append(path)
+    return result
+
+
+def run_replay(replay, board_backend='objects'):
+    """
+    重新执行一个回放。
+
+    :param replay: Replay 对象
+    :param board_backend: str，棋盘后端
+    :return: dict，执行结果
+    """
+    start = time.perf_counter()
+    game = HeadlessGame.from_replay(replay, board_backend=board_backend)
+    actions = game.play_replay(replay)
+    elapsed = time.perf_counter() - start
+    state = game.get_state()
+    return {
+        'actions': actions,
+        'seconds': elapsed,
+        'score': state['score'],
+        'is_game_over': state['is_game_over'],
+        'is_victory': state['is_victory'],
+        'matches_recording': (state['score'] == replay.final_score
+                              and state['is_game_over'] == replay.is_game_over
+                              and state['is_victory'] == replay.is_victory),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以无界面模式重新执行回放")
+    parser.add_argument('paths', nargs='+', help="回放文件或包含回放文件的目录")
+    parser.add_argument('--repeat', type=int, default=1, help="每个回放重复执行的次数")
+    parser.add_argument('--backend', default='objects', choices=['objects', 'array'], help="棋盘后端")
+    parser.add_argument('--json', action='store_true', help="以 JSON 格式输出结果")
+    args = parser.parse_args()
+
+    replays = [(path, Replay.load(path)) for path in collect_paths(args.paths)]
+    if not replays:
+        print("没有找到回放文件。")
+        return 1
+
+    report = {}
+    total_actions = 0
+    total_seconds = 0.0
+    mismatches = 0
+    for path, replay in replays:
+        runs = [run_replay(replay, args.backend) for _ in range(args.repeat)]
+        result = runs[-1]
+        seconds = sum(run['seconds'] for run in runs)
+        total_actions += result['actions'] * args.repeat
+        total_seconds += seconds
+        if not result['matches_recording']:
+            mismatches += 1
+        report[path] = {
+            'seed': replay.seed,
+            'actions': result['actions'],
+            'score': result['score'],
+            'is_victory': result['is_victory'],
+            'matches_recording': result['matches_recording'],
+            'avg_ms': round(seconds / args.repeat * 1000, 3),
+        }
+        if not args.json:
+            status = "一致" if result['matches_recording'] else "不一致"
+            print(f"{path}: {result['actions']} 步，得分 {result['score']}，"
+                  f"{'胜利' if result['is_victory'] else '未胜利'}，结果{status}，"
+                  f"平均 {report[path]['avg_ms']:.3f} 毫秒")
+
+    summary = {
+        'replays': len(replays),
+        'mismatches': mismatches,
+        'total_seconds': round(total_seconds, 3),
+        'actions_per_second': round(total_actions / total_seconds, 2) if total_seconds else 0.0,
+    }
+    if args.json:
+        print(json.dumps({'replays': report, 'summary': summary}, ensure_ascii=False, indent=4))
+    else:
+        print(f"共 {summary['replays']} 个回放，{mismatches} 个结果不一致，"
+              f"{summary['actions_per_second']:.0f} 步/秒")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
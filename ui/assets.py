@@ -1,75 +1,256 @@
 import pygame
+import io
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
 
 class Assets:
     """
     资源管理类，加载和管理游戏资源。
+    缩放后的图像按 (图像, 目标尺寸) 缓存，稳定状态下每帧不需要再缩放。
+
+    资源文件通过扫描各类别的目录得到，不存在的目录直接跳过。
+    启用后台加载时，工作线程按优先级读取并解码图像，主线程在 poll 中把解码结果转换为显示格式
+    （convert 需要显示环境，只能在主线程调用）。尚未加载的图像返回 None，界面使用各自的占位绘制；
+    当前场景需要的资源可以提高优先级，必须立即使用的资源用 ensure_loaded 在主线程中补齐。
     """
 
-    def __init__(self):
+    CATEGORY_DIRS = {
+        'pattern': 'patterns',
+        'button': 'buttons',
+        'item': 'items',
+        'background': 'backgrounds',
+        'logo': 'logo',
+    }
+    CATEGORY_PRIORITY = {'background': 1, 'logo': 1, 'pattern': 2}  # 其余类别为 3
+    ASSET_LOADED = pygame.event.custom_type()  # 后台解码完成一个图像时发送，用于唤醒等待输入的主循环
+
+    def __init__(self, scaled_cache_size=256, background_loading=False, root="assets"):
         """
         初始化资源管理器，加载所有需要的资源。
+
+        :param scaled_cache_size: int，缩放图像缓存的最大条目数，超出时淘汰最久未使用的条目
+        :param background_loading: bool，是否在后台线程中加载资源；为 False 时在构造时同步加载全部资源
+        :param root: str，资源根目录
         """
+        self.scaled_cache = OrderedDict()  # (类别, 名称, 尺寸) -> 缩放并转换为显示格式的图像
+        self.scaled_cache_size = scaled_cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.pattern_images = {}
         self.button_images = {}
         self.item_images = {}
         self.background_images = {}
         self.logo_images = {}
-        self.load_assets()
+
+        self.root = root
+        self.manifest = self.build_manifest()  # (类别, 名称) -> 文件路径
+        self.loaded = set()                    # 已加载（或加载失败）的资源
+        self.recently_loaded = []              # 上次 poll 之后加载的资源
+        self.pending = set(self.manifest)      # 还没有被任何线程开始加载的资源
+        self.lock = threading.Lock()
+        self.requests = queue.PriorityQueue()  # (优先级, 序号, (类别, 名称))，同一资源可以重复放入
+        self.decoded = queue.Queue()           # 后台线程解码完成的 ((类别, 名称), 图像, 解码秒数)
+        self.request_count = 0
+        self.worker = None
+        self.load_stats = {
+            'files': len(self.manifest),
+            'failed': 0,
+            'decode_ms': 0.0,
+            'convert_ms': 0.0,
+            'started': time.perf_counter(),
+            'finished': None,
+        }
+        if not self.manifest:
+            self.load_stats['finished'] = self.load_stats['started']
+
+        if background_loading:
+            self.start_background_loading()
+        else:
+            self.load_assets()
+
+    def build_manifest(self):
+        """
+        扫描各类别的资源目录，列出需要加载的图像文件。
+
+        :return: dict，(类别, 名称) -> 文件路径，按加载优先级排列
+        """
+        manifest = {}
+        for category, directory in self.CATEGORY_DIRS.items():
+            path = os.path.join(self.root, directory)
+            if not os.path.isdir(path):
+                continue
+            for filename in sorted(os.listdir(path)):
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() != '.png':
+                    continue
+                name = stem
+                if category == 'pattern':
+                    # 图案文件名为 pattern_<ID>.png，名称使用图案ID
+                    prefix, _, number = stem.partition('_')
+                    if prefix != 'pattern' or not number.isdigit():
+                        continue
+                    name = int(number)
+                manifest[(category, name)] = os.path.join(path, filename)
+        return dict(sorted(manifest.items(), key=lambda item: self.CATEGORY_PRIORITY.get(item[0][0], 3)))
 
     def load_assets(self):
         """
-        加载游戏所需的图像和音频资源。
-        """
-        # 加载图案图片
-        for i in range(10):  # 假设有10种图案
-            image_path = os.path.join("assets", "patterns", f"pattern_{i}.png")
-            if os.path.exists(image_path):
-                image = pygame.image.load(image_path).convert_alpha()
-                # 图案大小根据屏幕尺寸缩放，在使用时再缩放
-                self.pattern_images[i] = image
-            else:
-                print(f"图案资源不存在：{image_path}")
-
-        # 加载按钮图片
-        button_names = ["start_button", "settings_icon", "rank_icon", "quit_button", "hint_button", "undo_button"]
-        for name in button_names:
-            image_path = os.path.join("assets", "buttons", f"{name}.png")
-            if os.path.exists(image_path):
-                image = pygame.image.load(image_path).convert_alpha()
-                self.button_images[name] = image
-            else:
-                print(f"按钮资源不存在：{image_path}")
-
-        # 加载道具图片
-        item_names = ["hint_item", "undo_item"]
-        for name in item_names:
-            image_path = os.path.join("assets", "items", f"{name}.png")
-            if os.path.exists(image_path):
-                image = pygame.image.load(image_path).convert_alpha()
-                self.item_images[name] = image
-            else:
-                print(f"道具资源不存在：{image_path}")
-
-        # 加载背景图片
-        background_names = ["menu_background", "game_background"]
-        for name in background_names:
-            image_path = os.path.join("assets", "backgrounds", f"{name}.png")
-            if os.path.exists(image_path):
-                image = pygame.image.load(image_path).convert()
-                self.background_images[name] = image
-            else:
-                print(f"背景资源不存在：{image_path}")
-
-        # 加载Logo和标题
-        logo_names = ["game_logo", "game_title"]
-        for name in logo_names:
-            image_path = os.path.join("assets", "logo", f"{name}.png")
-            if os.path.exists(image_path):
-                image = pygame.image.load(image_path).convert_alpha()
-                self.logo_images[name] = image
-            else:
-                print(f"Logo资源不存在：{image_path}")
+        在主线程中同步加载全部图像资源。
+        """
+        self.ensure_loaded(self.manifest)
+
+    def start_background_loading(self):
+        """
+        启动后台加载线程，按类别优先级依次加载全部资源。
+        """
+        for key in self.manifest:
+            self.request(key, self.CATEGORY_PRIORITY.get(key[0], 3))
+        if self.pending:
+            self.worker = threading.Thread(target=self.run_worker, name="asset-loader", daemon=True)
+            self.worker.start()
+
+    def request(self, key, priority):
+        """
+        把资源放入后台加载队列。
+
+        :param key: (类别, 名称)
+        :param priority: int，数值越小越先加载
+        """
+        self.request_count += 1
+        self.requests.put((priority, self.request_count, key))
+
+    def prioritize(self, keys):
+        """
+        优先加载指定的资源（例如当前场景需要的资源）。
+
+        :param keys: 可迭代对象，(类别, 名称)
+        """
+        for key in keys:
+            if key in self.pending:
+                self.request(key, 0)
+
+    def run_worker(self):
+        """
+        后台线程：按优先级读取并解码图像，直到所有资源都已开始加载。
+        """
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return
+            _, _, key = self.requests.get()
+            with self.lock:
+                if key not in self.pending:
+                    continue  # 已被主线程或更早的请求加载
+                self.pending.discard(key)
+            self.decoded.put((key,) + self.decode(key))
+            try:
+                pygame.event.post(pygame.event.Event(self.ASSET_LOADED))
+            except pygame.error:
+                pass  # 显示已关闭
+
+    def decode(self, key):
+        """
+        读取并解码图像文件，不转换像素格式，可以在任意线程中调用。
+
+        :param key: (类别, 名称)
+        :return: (pygame.Surface 或 None, 解码秒数)
+        """
+        path = self.manifest[key]
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            image = pygame.image.load(io.BytesIO(data), path)
+        except (OSError, pygame.error) as e:
+            print(f"资源加载失败：{path}（{e}）")
+            image = None
+        return image, time.perf_counter() - start
+
+    def store(self, key, image, decode_seconds):
+        """
+        在主线程中把解码后的图像转换为显示格式并保存。
+
+        :param key: (类别, 名称)
+        :param image: pygame.Surface 或 None（加载失败）
+        :param decode_seconds: float，解码耗时
+        """
+        category, name = key
+        start = time.perf_counter()
+        if image is not None:
+            # 背景不需要透明通道，其余图像保留透明通道
+            image = image.convert() if category == 'background' else image.convert_alpha()
+            self.get_category_images(category)[name] = image
+        else:
+            self.load_stats['failed'] += 1
+        self.loaded.add(key)
+        self.recently_loaded.append(key)
+        self.load_stats['decode_ms'] += decode_seconds * 1000
+        self.load_stats['convert_ms'] += (time.perf_counter() - start) * 1000
+        if len(self.loaded) == len(self.manifest):
+            self.load_stats['finished'] = time.perf_counter()
+
+    def poll(self, budget=0.004):
+        """
+        转换后台线程已解码的图像，每次调用最多占用约 budget 秒。
+
+        :param budget: float，时间预算（秒），至少转换一个图像
+        :return: list，上次 poll 之后新加载的 (类别, 名称)，包括 ensure_loaded 加载的资源
+        """
+        start = time.perf_counter()
+        while True:
+            try:
+                key, image, decode_seconds = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            self.store(key, image, decode_seconds)
+            if time.perf_counter() - start >= budget:
+                break
+        loaded, self.recently_loaded = self.recently_loaded, []
+        return loaded
+
+    def ensure_loaded(self, keys):
+        """
+        确保指定的资源已经加载：还没有开始加载的在主线程中立即加载，后台正在解码的等待其完成。
+
+        :param keys: 可迭代对象，(类别, 名称)；不存在的资源忽略
+        """
+        for key in keys:
+            if key not in self.manifest:
+                continue
+            with self.lock:
+                taken = key in self.pending
+                self.pending.discard(key)
+            if taken:
+                self.store(key, *self.decode(key))
+            while key not in self.loaded:
+                self.store(*self.decoded.get())
+
+    def is_loading(self):
+        """
+        是否还有资源没有加载完成。
+
+        :return: bool
+        """
+        return len(self.loaded) < len(self.manifest)
+
+    def get_load_stats(self):
+        """
+        获取资源加载的统计信息。
+
+        :return: dict，文件数、已加载数、失败数、解码和转换的累计耗时，以及全部加载完成的耗时（毫秒）
+        """
+        stats = self.load_stats
+        return {
+            'files': stats['files'],
+            'loaded': len(self.loaded),
+            'failed': stats['failed'],
+            'decode_ms': round(stats['decode_ms'], 1),
+            'convert_ms': round(stats['convert_ms'], 1),
+            'elapsed_ms': round((stats['finished'] - stats['started']) * 1000, 1) if stats['finished'] else None,
+        }
 
     def get_image(self, filename):
         """
@@ -130,3 +311,104 @@ class Assets:
         :return: pygame.Surface 对象
         """
         return self.logo_images.get(name, None)
+
+    def get_scaled_image(self, category, name, size):
+        """
+        获取缩放到指定尺寸的图像，结果已转换为显示格式并缓存。
+
+        :param category: str，图像类别（'pattern', 'button', 'item', 'background', 'logo'）
+        :param name: 图像名称或图案ID
+        :param size: (width, height)，目标尺寸
+        :return: pygame.Surface 对象；原图不存在时返回 None
+        """
+        key = (category, name, (int(size[0]), int(size[1])))
+        image = self.scaled_cache.get(key)
+        if image is not None:
+            self.cache_hits += 1
+            self.scaled_cache.move_to_end(key)
+            return image
+
+        source = self.get_source_image(category, name)
+        if source is None:
+            return None
+        self.cache_misses += 1
+        image = pygame.transform.scale(source, key[2])
+        # 转换为显示格式，之后的 blit 不需要逐像素转换
+        image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+        self.scaled_cache[key] = image
+        if len(self.scaled_cache) > self.scaled_cache_size:
+            self.scaled_cache.popitem(last=False)
+        return image
+
+    def get_source_image(self, category, name):
+        """
+        获取指定类别和名称的原始图像。
+
+        :param category: str，图像类别
+        :param name: 图像名称或图案ID
+        :return: pygame.Surface 对象
+        """
+        return self.get_category_images(category).get(name, None)
+
+    def get_category_images(self, category):
+        """
+        获取指定类别的图像字典。
+
+        :param category: str，图像类别
+        :return: dict，名称 -> pygame.Surface
+        """
+        return {
+            'pattern': self.pattern_images,
+            'button': self.button_images,
+            'item': self.item_images,
+            'background': self.background_images,
+            'logo': self.logo_images,
+        }[category]
+
+    def get_scaled_pattern_image(self, pattern_id, size):
+        """
+        获取缩放到指定尺寸的图案图像。
+
+        :param pattern_id: int，图案ID
+        :param size: (width, height)，目标尺寸
+        :return: pygame.Surface 对象
+        """
+        return self.get_scaled_image('pattern', pattern_id, size)
+
+    def get_scaled_background_image(self, name, size):
+        """
+        获取缩放到指定尺寸的背景图像。
+
+        :param name: str，背景名称
+        :param size: (width, height)，目标尺寸
+        :return: pygame.Surface 对象
+        """
+        return self.get_scaled_image('background', name, size)
+
+    def get_scaled_logo_image(self, name, size):
+        """
+        获取缩放到指定尺寸的Logo或标题图像。
+
+        :param name: str，Logo名称
+        :param size: (width, height)，目标尺寸
+        :return: pygame.Surface 对象
+        """
+        return self.get_scaled_image('logo', name, size)
+
+    def get_cache_stats(self):
+        """
+        获取缩放图像缓存的统计信息。
+
+        :return: dict，包含命中次数、未命中次数和当前条目数
+        """
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self.scaled_cache),
+        }
+
+    def clear_scaled_cache(self):
+        """
+        清空缩放图像缓存（例如窗口尺寸改变时）。
+        """
+        self.scaled_cache.clear()
@@ -0,0 +1,359 @@
+# ui/board_cache.py
+
+import bisect
+
+import pygame
+
+from core.spatial_index import SpatialGrid
+
+
+class LayerCompositeCache:
+    """
+    棋盘图层合成缓存。
+    把各层按图案数量切分成若干段连续的层，第 k 个合成图 = 背景 + 第 0..k 段的全部图案，
+    都是不透明的整屏图像。某段中的图案被消除或恢复时，只有该段及其上方的合成图中
+    该图案所在的区域失效；修复时从下方的合成图复制该区域，再补画本段中与该区域相交的图案。
+    每帧绘制棋盘只需一次 blit。
+
+    每段维护一个按 (层号, 下标) 排序的可见图案绘制列表，消除和恢复时增量更新；
+    每个图案的图像和位置只计算一次，绘制时用 Surface.blits 批量提交。
+
+    启用遮挡剔除时，被绘制顺序在其之后（包括同一层中下标更大）的未消除不透明图案完全盖住的图案
+    不进入绘制列表。开始时按绘制顺序自上而下扫描一遍，用覆盖掩码判断每个图案是否被盖满；
+    图案被消除时只在该图案的区域内重新扫描，恢复时只重新判断与它重叠、绘制顺序在它之前的可见图案。
+    可选地在最上方叠加一段“堆叠深度”阴影，每个被隐藏的图案在其中心画一个半透明的小方块，
+    隐藏的图案越多颜色越深。
+    """
+
+    SHADE_COLOR = (0, 0, 0, 48)   # 堆叠深度阴影的颜色
+    SHADE_RATIO = 0.3             # 阴影方块边长占图案边长的比例
+
+    def __init__(self, patterns, screen_size, assets, background=None, bg_color=(0, 0, 0), max_runs=4,
+                 cull_hidden=False, depth_indicator=False):
+        """
+        初始化合成缓存。
+
+        :param patterns: list，棋盘上的全部图案
+        :param screen_size: (width, height)，屏幕尺寸
+        :param assets: Assets 对象，用于获取缩放后的图案图像
+        :param background: pygame.Surface，已缩放到屏幕尺寸的背景；为 None 时使用纯色
+        :param bg_color: tuple，没有背景图像时的填充颜色
+        :param max_runs: int，最多切分的层段数量
+        :param cull_hidden: bool，是否跳过被完全遮挡的图案
+        :param depth_indicator: bool，是否为被完全遮挡的图案绘制堆叠深度阴影（需要 cull_hidden）
+        """
+        self.assets = assets
+        self.base = pygame.Surface(screen_size).convert()
+        if background is not None:
+            self.base.blit(background, (0, 0))
+        else:
+            self.base.fill(bg_color)
+
+        # 每个图案的 (图像, 目标矩形) 只计算一次
+        self.blit_items = {pattern.index: self.get_blit_item(pattern) for pattern in patterns}
+
+        # 遮挡剔除：空间索引用于查找重叠的图案，hidden 为被完全遮挡的图案下标
+        self.spatial_index = None
+        self.opaque_images = {}  # id(图像) -> 图像是否完全不透明，只有不透明的图案才能遮挡下方的图案
+        self.tile_masks = {}     # 尺寸 -> 全满掩码
+        self.hidden = set()
+        if cull_hidden and patterns:
+            self.spatial_index = SpatialGrid.build(patterns, max(p.size[0] for p in patterns))
+            rects = [self.blit_items[p.index][1] for p in patterns]
+            self.hidden = self.sweep([p for p in patterns if not p.is_cleared], rects[0].unionall(rects[1:]))
+
+        # 按层号分组，并把连续的层切分成图案数量大致相等的若干段
+        layers = {}
+        for pattern in sorted(patterns, key=lambda p: (p.layer, p.index)):
+            layers.setdefault(pattern.layer, []).append(pattern)
+        runs = []                # 每段包含的图案，按绘制顺序排列
+        self.run_of_layer = {}   # 层号 -> 段号
+        run_count = max(1, min(max_runs, len(layers)))
+        total = len(patterns)
+        current = []
+        placed = 0
+        for layer in sorted(layers):
+            current.extend(layers[layer])
+            placed += len(layers[layer])
+            self.run_of_layer[layer] = len(runs)
+            if placed * run_count >= total * (len(runs) + 1) and len(runs) < run_count - 1:
+                runs.append(current)
+                current = []
+        if current or not runs:
+            runs.append(current)
+
+        # 每段的可见图案绘制列表及其排序键，消除和恢复时增量维护
+        self.draw_lists = [[p for p in run if self.is_drawn(p)] for run in runs]
+        self.run_items = [self.blit_items] * len(runs)  # 每段使用的 (图像, 目标矩形)
+        self.shade_run = None
+        if depth_indicator and self.spatial_index is not None:
+            # 阴影作为最上方的一段，复用合成图的失效和修复逻辑
+            self.shade_run = len(runs)
+            self.draw_lists.append([p for run in runs for p in run if p.index in self.hidden and not p.is_cleared])
+            self.run_items = self.run_items + [self.get_shade_items(patterns)]
+            runs.append([])
+        self.draw_keys = [[(p.layer, p.index) for p in draw_list] for draw_list in self.draw_lists]
+
+        self.composites = [None] * len(runs)  # 第 k 段的合成图
+        self.valid_runs = 0      # 前 valid_runs 个合成图已创建且完整
+        self.dirty_regions = [[] for _ in runs]  # 每段合成图中需要修复的区域
+        self.rebuilds = 0        # 整体重建的合成图数量
+        self.repairs = 0         # 局部修复的区域数量
+        self.tile_blits = 0      # 重建和修复时绘制的图案数量
+
+    def get_blit_item(self, pattern):
+        """
+        计算图案的图像和绘制位置，没有图像时使用白色方块。
+
+        :param pattern: Pattern 对象
+        :return: (pygame.Surface, pygame.Rect)
+        """
+        x, y = pattern.position
+        pattern_image = self.assets.get_scaled_pattern_image(pattern.id, pattern.size)
+        if pattern_image:
+            return pattern_image, pattern_image.get_rect(center=(x, y))
+        block = pygame.Surface((int(pattern.size[0]), int(pattern.size[1]))).convert()
+        block.fill((255, 255, 255))
+        return block, pygame.Rect(x - pattern.size[0] / 2, y - pattern.size[1] / 2, *pattern.size)
+
+    def get_shade_items(self, patterns):
+        """
+        计算每个图案的堆叠深度阴影的图像和位置，所有图案共用同一个阴影图像。
+
+        :param patterns: list，棋盘上的全部图案
+        :return: dict，图案下标 -> (pygame.Surface, pygame.Rect)
+        """
+        shade_items = {}
+        shades = {}  # 尺寸 -> 阴影图像
+        for pattern in patterns:
+            size = (max(1, int(pattern.size[0] * self.SHADE_RATIO)), max(1, int(pattern.size[1] * self.SHADE_RATIO)))
+            shade = shades.get(size)
+            if shade is None:
+                shade = shades[size] = pygame.Surface(size, pygame.SRCALPHA)
+                shade.fill(self.SHADE_COLOR)
+            shade_items[pattern.index] = (shade, shade.get_rect(center=self.blit_items[pattern.index][1].center))
+        return shade_items
+
+    def is_drawn(self, pattern):
+        """
+        图案是否需要绘制：未消除且没有被完全遮挡。
+
+        :param pattern: Pattern 对象
+        """
+        return not pattern.is_cleared and pattern.index not in self.hidden
+
+    def is_opaque(self, pattern):
+        """
+        图案的图像是否完全不透明，结果按图像缓存。
+
+        :param pattern: Pattern 对象
+        """
+        image = self.blit_items[pattern.index][0]
+        opaque = self.opaque_images.get(id(image))
+        if opaque is None:
+            if image.get_flags() & pygame.SRCALPHA:
+                width, height = image.get_size()
+                opaque = pygame.mask.from_surface(image, 254).count() == width * height
+            else:
+                opaque = image.get_alpha() is None and image.get_colorkey() is None
+            self.opaque_images[id(image)] = opaque
+        return opaque
+
+    def get_overlapping(self, pattern, above):
+        """
+        获取与图案重叠、未消除且绘制顺序在其之后（或之前）的图案。
+
+        :param pattern: Pattern 对象
+        :param above: bool，True 取绘制在它上面的图案，False 取绘制在它下面的图案
+        :return: list，Pattern 对象
+        """
+        key = (pattern.layer, pattern.index)
+        return [
+            other for other in self.spatial_index.query_overlaps(pattern)
+            if not other.is_cleared and ((other.layer, other.index) > key) == above
+        ]
+
+    def get_tile_mask(self, size):
+        """
+        获取指定尺寸的全满掩码，按尺寸缓存。
+
+        :param size: (width, height)
+        :return: pygame.Mask
+        """
+        mask = self.tile_masks.get(size)
+        if mask is None:
+            mask = self.tile_masks[size] = pygame.Mask(size, fill=True)
+        return mask
+
+    def sweep(self, patterns, region):
+        """
+        在区域内按绘制顺序自上而下扫描图案，用覆盖掩码找出在区域内被上方图案完全盖住的图案。
+
+        :param patterns: 可迭代对象，与区域相交的未消除图案
+        :param region: pygame.Rect，扫描的区域
+        :return: set，在区域内被完全盖住的图案下标
+        """
+        covered = pygame.Mask(region.size)
+        full = region.width * region.height
+        hidden = set()
+        ordered = sorted(patterns, key=lambda p: (p.layer, p.index), reverse=True)
+        for position, pattern in enumerate(ordered):
+            if covered.count() == full:
+                # 区域已被盖满，下面的图案在区域内都被完全盖住
+                hidden.update(p.index for p in ordered[position:])
+                break
+            rect = self.blit_items[pattern.index][1]
+            mask = self.get_tile_mask(rect.size)
+            offset = (rect.x - region.x, rect.y - region.y)
+            visible = rect.clip(region)
+            if covered.overlap_area(mask, offset) == visible.width * visible.height:
+                hidden.add(pattern.index)
+            if self.is_opaque(pattern):
+                covered.draw(mask, offset)
+        return hidden
+
+    def is_hidden(self, pattern):
+        """
+        判断图案是否被绘制在它上面的未消除不透明图案完全盖住。
+
+        :param pattern: Pattern 对象
+        :return: bool
+        """
+        above = self.get_overlapping(pattern, above=True)
+        return bool(above) and pattern.index in self.sweep(above + [pattern], self.blit_items[pattern.index][1])
+
+    def update_occlusion(self, pattern):
+        """
+        图案被消除或恢复后，更新它和绘制在它下面的图案的遮挡状态。
+
+        :param pattern: Pattern 对象
+        :return: list，遮挡状态改变的图案
+        """
+        changed = []
+        if pattern.is_cleared:
+            # 只有该图案区域内的覆盖情况改变，被隐藏的图案在这个区域内不再被盖满时才会露出来
+            self.hidden.discard(pattern.index)
+            below = self.get_overlapping(pattern, above=False)
+            if not any(other.index in self.hidden for other in below):
+                return changed  # 下方没有被隐藏的图案，多数消除都在这里返回
+            overlapping = self.get_overlapping(pattern, above=True) + below
+            still_hidden = self.sweep(overlapping, self.blit_items[pattern.index][1])
+            for other in overlapping:
+                if other.index in self.hidden and other.index not in still_hidden:
+                    self.hidden.discard(other.index)
+                    changed.append(other)
+        else:
+            # 恢复的图案只可能盖住原本可见的图案
+            for other in [pattern] + self.get_overlapping(pattern, above=False):
+                if other.index not in self.hidden and self.is_hidden(other):
+                    self.hidden.add(other.index)
+                    if other is not pattern:
+                        changed.append(other)
+        return changed
+
+    def sync_draw_list(self, run, pattern, drawn):
+        """
+        按图案是否需要绘制，在段的绘制列表中插入或删除该图案。
+
+        :param run: int，段号
+        :param pattern: Pattern 对象
+        :param drawn: bool，是否需要绘制
+        """
+        draw_list, keys = self.draw_lists[run], self.draw_keys[run]
+        key = (pattern.layer, pattern.index)
+        position = bisect.bisect_left(keys, key)
+        present = position < len(keys) and keys[position] == key
+        if not drawn and present:
+            del draw_list[position]
+            del keys[position]
+        elif drawn and not present:
+            draw_list.insert(position, pattern)
+            keys.insert(position, key)
+
+    def invalidate(self, pattern, **_):
+        """
+        图案被消除或恢复后，更新所在段的绘制列表和遮挡状态，
+        并使其所在段及上方各段合成图中这些图案的区域失效。
+
+        :param pattern: Pattern 对象
+        """
+        changed = [pattern]
+        if self.spatial_index is not None:
+            changed.extend(self.update_occlusion(pattern))
+        for p in changed:
+            run = self.run_of_layer.get(p.layer, 0)
+            self.sync_draw_list(run, p, self.is_drawn(p))
+            if self.shade_run is not None:
+                self.sync_draw_list(self.shade_run, p, not p.is_cleared and p.index in self.hidden)
+            rect = self.get_pattern_rect(p)
+            for k in range(run, len(self.draw_lists)):
+                self.dirty_regions[k].append(rect)
+
+    def invalidate_all(self):
+        """
+        使全部合成图失效。
+        """
+        self.valid_runs = 0
+        for regions in self.dirty_regions:
+            regions.clear()
+
+    def get_surface(self):
+        """
+        获取包含背景和全部未消除图案的合成图，必要时重建或修复失效部分。
+
+        :return: pygame.Surface
+        """
+        while self.valid_runs < len(self.draw_lists):
+            k = self.valid_runs
+            below = self.composites[k - 1] if k > 0 else self.base
+            surface = self.composites[k]
+            if surface is None:
+                surface = below.copy()
+                self.composites[k] = surface
+            else:
+                surface.blit(below, (0, 0))
+            self.tile_blits += len(self.draw_lists[k])
+            run_items = self.run_items[k]
+            surface.blits([run_items[p.index] for p in self.draw_lists[k]], False)
+            self.dirty_regions[k].clear()
+            self.rebuilds += 1
+            self.valid_runs += 1
+
+        # 自下而上修复，保证复制时下方的合成图已经是最新的
+        for k, regions in enumerate(self.dirty_regions):
+            if not regions:
+                continue
+            below = self.composites[k - 1] if k > 0 else self.base
+            surface = self.composites[k]
+            run_items = self.run_items[k]
+            for rect in regions:
+                surface.set_clip(rect)
+                surface.blit(below, rect, rect)
+                items = [run_items[p.index] for p in self.draw_lists[k]]
+                items = [item for item in items if rect.colliderect(item[1])]
+                self.tile_blits += len(items)
+                surface.blits(items, False)
+                self.repairs += 1
+            surface.set_clip(None)
+            regions.clear()
+        return self.composites[-1]
+
+    def draw(self, screen):
+        """
+        把合成图绘制到屏幕（遵循屏幕当前的裁剪区域）。
+
+        :param screen: pygame.Surface
+        """
+        screen.blit(self.get_surface(), (0, 0))
+
+    @staticmethod
+    def get_pattern_rect(pattern):
+        """
+        获取图案绘制时覆盖的区域（向外多取 1 像素，包含取整误差）。
+
+        :param pattern: Pattern 对象
+        :return: pygame.Rect
+        """
+        x, y = pattern.position
+        width, height = pattern.size
+        return pygame.Rect(x - width / 2, y - height / 2, width, height).inflate(2, 2)
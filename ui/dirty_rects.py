@@ -0,0 +1,85 @@
+# ui/dirty_rects.py
+
+import pygame
+
+
+class DirtyRectTracker:
+    """
+    记录需要重绘的屏幕区域。
+    每帧取出合并后的区域列表：区域过多或面积过大时退化为整屏重绘。
+    """
+
+    def __init__(self, screen_size, max_rects=24, full_ratio=0.6):
+        """
+        初始化脏矩形记录器。
+
+        :param screen_size: (width, height)，屏幕尺寸
+        :param max_rects: int，合并后区域数量超过该值时整屏重绘
+        :param full_ratio: float，区域总面积超过屏幕面积的该比例时整屏重绘
+        """
+        self.screen_rect = pygame.Rect(0, 0, *screen_size)
+        self.max_rects = max_rects
+        self.full_ratio = full_ratio
+        self.rects = []
+        self.full = True  # 第一帧总是整屏绘制
+
+    def invalidate(self, rect):
+        """
+        标记一个区域需要重绘。
+
+        :param rect: pygame.Rect 或 (x, y, w, h)
+        """
+        if self.full:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def invalidate_all(self):
+        """
+        标记整个屏幕需要重绘。
+        """
+        self.full = True
+        self.rects.clear()
+
+    def has_dirty(self):
+        return self.full or bool(self.rects)
+
+    def take(self):
+        """
+        取出本帧需要重绘的区域并清空记录。
+
+        :return: (是否整屏重绘, 合并后的区域列表)
+        """
+        full, rects = self.full, self.merge(self.rects)
+        self.full = False
+        self.rects = []
+        if not full:
+            area = sum(rect.width * rect.height for rect in rects)
+            if len(rects) > self.max_rects or area > self.screen_rect.width * self.screen_rect.height * self.full_ratio:
+                full = True
+        if full:
+            return True, [self.screen_rect.copy()]
+        return False, rects
+
+    @staticmethod
+    def merge(rects):
+        """
+        把相交的区域合并为外接矩形，直到没有区域相交。
+
+        :param rects: list，pygame.Rect
+        :return: list，互不相交的 pygame.Rect
+        """
+        merged = []
+        for rect in rects:
+            rect = rect.copy()
+            changed = True
+            while changed:
+                changed = False
+                for i, other in enumerate(merged):
+                    if rect.colliderect(other):
+                        rect.union_ip(merged.pop(i))
+                        changed = True
+                        break
+            merged.append(rect)
+        return merged
@@ -0,0 +1,79 @@
+# ui/fonts.py
+
+import pygame
+from collections import OrderedDict
+
+
+class FontRegistry:
+    """
+    字体注册表和文字图像缓存。
+    字体按 (名称, 字号, 是否加粗) 只创建一次；渲染结果按 (字体, 文本, 颜色) 缓存，
+    内容不变的文字不会重复渲染。
+    """
+
+    def __init__(self, text_cache_size=512):
+        """
+        初始化字体注册表。
+
+        :param text_cache_size: int，文字图像缓存的最大条目数，超出时淘汰最久未使用的条目
+        """
+        self.fonts = {}                  # (名称, 字号, 是否加粗) -> pygame.font.Font
+        self.text_cache = OrderedDict()  # (字体, 文本, 颜色) -> pygame.Surface
+        self.text_cache_size = text_cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def get_font(self, name, size, bold=False):
+        """
+        获取字体，相同参数的字体只创建一次。
+
+        :param name: str，系统字体名称
+        :param size: int，字号
+        :param bold: bool，是否加粗
+        :return: pygame.font.Font
+        """
+        key = (name, int(size), bool(bold))
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, key[1], bold=key[2])
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color):
+        """
+        渲染抗锯齿文字，结果会被缓存。
+
+        :param font: pygame.font.Font，由 get_font 获取的字体
+        :param text: str，文本
+        :param color: tuple，文字颜色
+        :return: pygame.Surface
+        """
+        key = (font, text, tuple(color))
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.cache_hits += 1
+            self.text_cache.move_to_end(key)
+            return surface
+        self.cache_misses += 1
+        surface = font.render(text, True, color)
+        self.text_cache[key] = surface
+        if len(self.text_cache) > self.text_cache_size:
+            self.text_cache.popitem(last=False)
+        return surface
+
+    def get_cache_stats(self):
+        """
+        获取字体和文字缓存的统计信息。
+
+        :return: dict
+        """
+        return {
+            'fonts': len(self.fonts),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self.text_cache),
+        }
+
+
+# 全局共享的字体注册表，界面和按钮使用同一份缓存
+font_registry = FontRegistry()
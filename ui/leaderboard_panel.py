@@ -0,0 +1,147 @@
+# ui/leaderboard_panel.py
+
+import pygame
+
+from ui.fonts import font_registry
+
+
+class LeaderboardPanel:
+    """
+    排行榜面板。
+    背景、标题和表头预先绘制成一张静态图像，所有记录行绘制成一张长图像，
+    只在排行榜数据版本变化时重建；滚动时只改变从长图像中截取的区域，不分配新的图像。
+    """
+
+    def __init__(self, screen_size, leaderboard_manager, background=None, bg_color=(0, 0, 0), bottom=None):
+        """
+        初始化排行榜面板。
+
+        :param screen_size: (width, height)，屏幕尺寸
+        :param leaderboard_manager: LeaderboardManager 对象
+        :param background: pygame.Surface，已缩放到屏幕尺寸的背景；为 None 时使用纯色
+        :param bg_color: tuple，没有背景图像时的填充颜色
+        :param bottom: int，记录列表区域的下边界（例如返回按钮的上边缘），默认到屏幕底部
+        """
+        self.screen_width, self.screen_height = screen_size
+        self.leaderboard_manager = leaderboard_manager
+        self.background = background
+        self.bg_color = bg_color
+
+        self.row_height = int(self.screen_height * 0.07)
+        self.start_y = self.screen_height * 0.3
+        self.column_positions = [
+            self.screen_width * 0.15,
+            self.screen_width * 0.4,
+            self.screen_width * 0.6,
+            self.screen_width * 0.85
+        ]
+        # 记录列表的可见区域：从第一行的上边缘到 bottom
+        top = int(self.start_y + self.row_height / 2)
+        bottom = self.screen_height if bottom is None else int(bottom)
+        self.viewport = pygame.Rect(0, top, self.screen_width, max(0, bottom - top))
+
+        self.frame = None         # 背景、标题和表头
+        self.rows = None          # 全部记录行
+        self.version = None       # 已绘制的数据版本
+        self.scroll = 0           # 当前滚动位置（像素）
+        self.view_area = pygame.Rect(0, 0, self.viewport.width, self.viewport.height)  # 复用的截取区域
+
+    def rebuild(self):
+        """
+        按当前排行榜数据重建静态图像和记录行图像。
+        """
+        leaderboard = self.leaderboard_manager.get_leaderboard() if self.leaderboard_manager else []
+        if self.frame is None:
+            self.frame = pygame.Surface((self.screen_width, self.screen_height)).convert()
+        if self.background is not None:
+            self.frame.blit(self.background, (0, 0))
+        else:
+            self.frame.fill(self.bg_color)
+
+        # 添加半透明覆盖层
+        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 150))  # 黑色半透明
+        self.frame.blit(overlay, (0, 0))
+
+        # 绘制排行榜标题
+        title_font = font_registry.get_font("SimHei", int(self.screen_height * 0.08), bold=True)
+        title_text = font_registry.render(title_font, "排行榜", (255, 215, 0))  # 金色字体
+        self.frame.blit(title_text, title_text.get_rect(center=(self.screen_width / 2, self.screen_height * 0.1)))
+
+        # 绘制表头
+        header_font = font_registry.get_font("SimHei", int(self.screen_height * 0.04), bold=True)
+        for header, x in zip(["排名", "玩家", "分数", "时间(s)"], self.column_positions):
+            header_text = font_registry.render(header_font, header, (255, 255, 255))
+            self.frame.blit(header_text, header_text.get_rect(center=(x, self.screen_height * 0.2)))
+
+        # 绘制分割线
+        pygame.draw.line(self.frame, (255, 255, 255), (self.screen_width * 0.1, self.screen_height * 0.25),
+                         (self.screen_width * 0.9, self.screen_height * 0.25), 2)
+
+        # 如果排行榜为空，显示提示信息
+        if not leaderboard:
+            no_data_font = font_registry.get_font("SimHei", int(self.screen_height * 0.04), bold=True)
+            no_data_text = font_registry.render(no_data_font, "暂无排行榜数据", (255, 255, 255))
+            self.frame.blit(no_data_text, no_data_text.get_rect(center=(self.screen_width / 2, self.screen_height * 0.5)))
+
+        # 绘制全部记录行，行的位置与可见区域顶部对齐
+        entry_font = font_registry.get_font("SimHei", int(self.screen_height * 0.035))
+        self.rows = pygame.Surface(
+            (self.screen_width, max(self.viewport.height, len(leaderboard) * self.row_height)), pygame.SRCALPHA
+        )
+        for index, entry in enumerate(leaderboard, start=1):
+            y = (index - 0.5) * self.row_height  # 行中心在长图像中的位置
+
+            # 交替行背景色
+            row_color = (50, 50, 50, 100) if index % 2 == 0 else (80, 80, 80, 100)
+            self.rows.fill(row_color, pygame.Rect(self.screen_width * 0.1, y - self.row_height / 2,
+                                                  self.screen_width * 0.8, self.row_height - 10))
+
+            entry_data = [str(index), entry['player'], str(entry['score']), str(int(entry['time']))]
+            for data, x in zip(entry_data, self.column_positions):
+                entry_text = font_registry.render(entry_font, data, (255, 255, 255))
+                self.rows.blit(entry_text, entry_text.get_rect(center=(x, y)))
+
+        self.version = self.leaderboard_manager.version if self.leaderboard_manager else 0
+        self.scroll_by(0)  # 数据变少时把滚动位置限制在有效范围内
+
+    def set_background(self, background):
+        """
+        更换背景图像（例如背景在后台加载完成后），下次绘制时重建面板。
+
+        :param background: pygame.Surface，已缩放到屏幕尺寸的背景
+        """
+        self.background = background
+        self.frame = None
+
+    def is_stale(self):
+        """
+        检查面板是否需要按新的数据重建。
+        """
+        current = self.leaderboard_manager.version if self.leaderboard_manager else 0
+        return self.frame is None or self.version != current
+
+    def scroll_by(self, pixels):
+        """
+        滚动记录列表。
+
+        :param pixels: int，正数向下滚动
+        :return: bool，滚动位置是否改变
+        """
+        max_scroll = max(0, self.rows.get_height() - self.viewport.height) if self.rows else 0
+        scroll = min(max(0, self.scroll + int(pixels)), max_scroll)
+        changed = scroll != self.scroll
+        self.scroll = scroll
+        return changed
+
+    def draw(self, screen):
+        """
+        绘制排行榜面板（遵循屏幕当前的裁剪区域）。
+
+        :param screen: pygame.Surface
+        """
+        if self.is_stale():
+            self.rebuild()
+        screen.blit(self.frame, (0, 0))
+        self.view_area.y = self.scroll
+        screen.blit(self.rows, self.viewport, self.view_area)
@@ -0,0 +1,335 @@
+# ui/profiler.py
+
+import functools
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+from ui.fonts import font_registry
+
+
+class _NullPhase:
+    """
+    未启用分析器时使用的空计时区段。
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Phase:
+    """
+    一个命名的计时区段，同名区段复用同一个对象，避免每帧分配。
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class CountingSurface(pygame.Surface):
+    """
+    统计 blit 次数的画布。显示表面的方法是只读的，分析器启用时界面改为绘制到这块画布，
+    再把变化的区域复制到显示表面。
+    """
+
+    profiler = None
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.profiler.count('blits')
+        return super().blit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=1):
+        blit_sequence = list(blit_sequence)
+        self.profiler.count('blits', len(blit_sequence))
+        return super().blits(blit_sequence, doreturn)
+
+
+class FrameProfiler:
+    """
+    按帧统计各阶段耗时的分析器（默认关闭）。
+    保存最近若干帧的耗时用于计算 p50/p95/p99，可以在屏幕上显示统计浮层，
+    并把记录导出为 Chrome 追踪事件 JSON（可在 chrome://tracing 或 Perfetto 中查看）。
+    同时统计热点调用次数，例如点击检测、棋盘绘制、blit 和图像缩放。
+    """
+
+    NULL_PHASE = _NullPhase()
+
+    def __init__(self, enabled=False, window=300, max_trace_events=200000):
+        """
+        初始化帧分析器。
+
+        :param enabled: bool，是否启用
+        :param window: int，计算分位数使用的最近帧数
+        :param max_trace_events: int，保留的追踪事件数量上限，超出时丢弃最早的事件
+        """
+        self.enabled = enabled
+        self.window = window
+        self.overlay_visible = False
+        self.origin = time.perf_counter()
+        self.samples = {}        # 阶段名称 -> 最近若干帧的耗时（毫秒）
+        self.phases = {}         # 阶段名称 -> _Phase
+        self.frame_times = {}    # 本帧各阶段的累计耗时（毫秒）
+        self.counters = {}       # 计数器名称 -> 本帧累计次数
+        self.counter_samples = {}  # 计数器名称 -> 最近若干帧的次数
+        self.tracked = {}        # 计数器名称 -> 返回累计值的函数，每帧取差值
+        self.tracked_last = {}
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.frame_start = None
+        self.frame_count = 0
+        self.patched = []        # (对象, 属性名, 原始值)，停用时恢复
+        self.overlay_rect = pygame.Rect(4, 4, 300, 0)
+        self.overlay_background = None  # 浮层的半透明背景，尺寸变化时才重新创建
+
+    def phase(self, name):
+        """
+        获取命名计时区段，用于 with 语句。
+
+        :param name: str，阶段名称
+        :return: 上下文管理器
+        """
+        if not self.enabled:
+            return self.NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase(self, name)
+        return phase
+
+    def record(self, name, start, end):
+        """
+        记录一个区段的耗时，并写入追踪事件。
+
+        :param name: str，阶段名称
+        :param start: float，开始时间（perf_counter）
+        :param end: float，结束时间（perf_counter）
+        """
+        elapsed = (end - start) * 1000
+        self.frame_times[name] = self.frame_times.get(name, 0.0) + elapsed
+        self.trace_events.append({
+            'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+            'ts': round((start - self.origin) * 1e6, 1), 'dur': round(elapsed * 1000, 1),
+        })
+
+    def count(self, name, n=1):
+        """
+        增加热点调用计数。
+
+        :param name: str，计数器名称
+        :param n: int，增加的次数
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def track(self, name, getter):
+        """
+        登记一个累计计数器（例如缓存的未命中次数），每帧记录其增量。
+
+        :param name: str，计数器名称
+        :param getter: 可调用对象，返回当前累计值
+        """
+        self.tracked[name] = getter
+        self.tracked_last[name] = getter()
+
+    def instrument(self, obj, method_name, counter=None):
+        """
+        包装对象的方法，统计调用次数。停用分析器时恢复原方法。
+
+        :param obj: 任意对象
+        :param method_name: str，方法名称
+        :param counter: str，计数器名称，默认与方法名称相同
+        """
+        original = getattr(obj, method_name)
+        counter = counter or method_name
+        self.counters.setdefault(counter, 0)  # 没有被调用的热点也显示在统计中
+
+        @functools.wraps(original)
+        def counted(*args, **kwargs):
+            self.count(counter)
+            return original(*args, **kwargs)
+
+        self.patched.append((obj, method_name, obj.__dict__.get(method_name) if hasattr(obj, '__dict__') else original))
+        setattr(obj, method_name, counted)
+
+    def create_canvas(self, display):
+        """
+        创建与显示表面格式相同、统计 blit 次数的画布。
+
+        :param display: pygame.Surface，显示表面
+        :return: CountingSurface
+        """
+        canvas = CountingSurface(display.get_size(), 0, display)
+        canvas.profiler = self
+        self.counters.setdefault('blits', 0)
+        return canvas
+
+    def instrument_transforms(self):
+        """
+        统计 pygame.transform 中缩放和旋转操作的调用次数。
+        """
+        for name in ('scale', 'smoothscale', 'rotate', 'rotozoom'):
+            if hasattr(pygame.transform, name):
+                self.instrument(pygame.transform, name, 'transform')
+
+    def restore(self):
+        """
+        恢复所有被包装的方法。
+        """
+        for obj, method_name, original in reversed(self.patched):
+            self.unpatch(obj, method_name, original)
+        self.patched.clear()
+
+    def release(self, *objects):
+        """
+        恢复指定对象上被包装的方法并不再引用这些对象，例如开始新的一局时释放上一局的对象。
+
+        :param objects: 之前传给 instrument 的对象
+        """
+        kept = []
+        for entry in reversed(self.patched):
+            if any(entry[0] is obj for obj in objects):
+                self.unpatch(*entry)
+            else:
+                kept.append(entry)
+        self.patched = kept[::-1]
+
+    @staticmethod
+    def unpatch(obj, method_name, original):
+        """
+        恢复一个被包装的方法。
+
+        :param obj: 被包装的对象
+        :param method_name: str，方法名称
+        :param original: 原始值；为 None 表示实例上原本没有该属性
+        """
+        if original is None:
+            delattr(obj, method_name)  # 实例上原本没有该属性，恢复为类上的方法
+        else:
+            setattr(obj, method_name, original)
+
+    def begin_frame(self):
+        """
+        标记一帧开始。
+        """
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        标记一帧结束，把本帧的阶段耗时和计数写入滚动窗口。
+        """
+        if not self.enabled or self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.record('frame', self.frame_start, end)
+        for name, getter in self.tracked.items():
+            value = getter()
+            last = self.tracked_last[name]
+            # 累计值变小说明来源被重新创建（例如开始新的一局），从 0 开始计算
+            self.counters[name] = self.counters.get(name, 0) + (value - last if value >= last else value)
+            self.tracked_last[name] = value
+        for name, elapsed in self.frame_times.items():
+            self.samples.setdefault(name, deque(maxlen=self.window)).append(elapsed)
+        for name, value in self.counters.items():
+            self.counter_samples.setdefault(name, deque(maxlen=self.window)).append(value)
+            self.trace_events.append({
+                'name': name, 'ph': 'C', 'pid': 1, 'tid': 1,
+                'ts': round((end - self.origin) * 1e6, 1), 'args': {'count': value},
+            })
+        self.frame_times.clear()
+        self.counters = {name: 0 for name in self.counters}
+        self.frame_count += 1
+
+    @staticmethod
+    def percentile(values, fraction):
+        """
+        计算已排序数据的分位数（最近秩法）。
+
+        :param values: list，已排序的数据
+        :param fraction: float，0~1
+        :return: float
+        """
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+        return values[index]
+
+    def get_stats(self):
+        """
+        获取各阶段耗时的滚动分位数和各计数器的平均每帧次数。
+
+        :return: dict
+        """
+        phases = {}
+        for name, samples in self.samples.items():
+            values = sorted(samples)
+            phases[name] = {
+                'p50': self.percentile(values, 0.50),
+                'p95': self.percentile(values, 0.95),
+                'p99': self.percentile(values, 0.99),
+            }
+        counters = {
+            name: sum(samples) / len(samples)
+            for name, samples in self.counter_samples.items() if samples
+        }
+        return {'frames': self.frame_count, 'phases': phases, 'counters': counters}
+
+    def export_trace(self, directory='profiles'):
+        """
+        把记录的事件导出为 Chrome 追踪事件 JSON 文件。
+
+        :param directory: str，导出目录
+        :return: str，文件路径
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': list(self.trace_events), 'displayTimeUnit': 'ms'}, file)
+        return path
+
+    def toggle_overlay(self):
+        """
+        显示或隐藏统计浮层。
+        """
+        self.overlay_visible = not self.overlay_visible
+
+    def draw_overlay(self, screen):
+        """
+        在屏幕左上角绘制各阶段耗时的 p50/p95/p99 和每帧调用次数。
+
+        :param screen: pygame.Surface
+        """
+        font = font_registry.get_font("Consolas", 14)
+        stats = self.get_stats()
+        lines = [f"frames {stats['frames']}   p50 / p95 / p99 (ms)"]
+        for name, values in sorted(stats['phases'].items()):
+            lines.append(f"{name:<22}{values['p50']:6.2f}{values['p95']:7.2f}{values['p99']:7.2f}")
+        for name, value in sorted(stats['counters'].items()):
+            lines.append(f"{name:<22}{value:8.1f} /frame")
+
+        line_height = font.get_linesize()
+        height = line_height * len(lines) + 8
+        self.overlay_rect.height = max(self.overlay_rect.height, height)
+        if self.overlay_background is None or self.overlay_background.get_size() != self.overlay_rect.size:
+            self.overlay_background = pygame.Surface(self.overlay_rect.size, pygame.SRCALPHA)
+            self.overlay_background.fill((0, 0, 0, 180))
+        screen.blit(self.overlay_background, self.overlay_rect)
+        y = self.overlay_rect.top + 4
+        for line in lines:
+            # 数值每帧变化，不放入文字缓存
+            screen.blit(font.render(line, True, (0, 255, 0)), (self.overlay_rect.left + 4, y))
+            y += line_height
@@ -2,9 +2,17 @@
 
 import pygame
 import sys
+import time
 from ui.assets import Assets
 from ui.utils import Button
+from ui.fonts import font_registry
+from ui.profiler import FrameProfiler
+from ui.dirty_rects import DirtyRectTracker
+from ui.board_cache import LayerCompositeCache
+from ui.leaderboard_panel import LeaderboardPanel
 from core.game_logic import GameLogic
+from core.leaderboard_manager import LeaderboardManager
+from core.events import TILE_CLEARED, TILE_RESTORED, MATCH
 from data.settings import Settings
 from data.scoreboard import Scoreboard
 from data.levels import LevelManager
@@ -13,27 +21,65 @@ from network.network_manager import NetworkManager
 class UIManager:
     """
     用户界面管理器，处理所有的界面显示和用户交互。
+    主循环按需调度：画面没有变化时阻塞等待输入，游戏中空闲时每秒只重绘一次倒计时，
+    窗口失去焦点时进一步降低刷新频率。
     """
-    def __init__(self):
+
+    IDLE_TIMEOUT_MS = 1000        # 静态界面空闲时最长的等待时间
+    UNFOCUSED_TIMEOUT_MS = 2000   # 窗口失去焦点时最长的等待时间
+    # 各场景需要的图像资源，切换场景时优先加载；模式选择界面提前加载游戏需要的图案
+    GAME_ASSETS = (('background', 'game_background'),) + tuple(('pattern', i) for i in range(10))
+    SCENE_ASSETS = {
+        "main_menu": (('background', 'menu_background'), ('logo', 'game_logo')),
+        "mode_selection": GAME_ASSETS,
+        "leaderboard": (('background', 'game_background'),),
+        "game": GAME_ASSETS,
+        "game_over": GAME_ASSETS,
+    }
+
+    def __init__(self, profile=None):
         """
         初始化界面管理器。
+
+        :param profile: bool，是否启用帧分析器（F3 显示统计浮层，F4 导出追踪文件）；
+                        为 None 时使用设置中的 'profiler' 选项
         """
 
+        self.startup_started = time.perf_counter()  # 用于启动耗时报告
+        self.first_frame_ms = None
+        self.startup_reported = False
+        self.startup_report = None  # 启动耗时报告，首帧显示且资源加载完成后生成
         pygame.init()
         self.settings = Settings()
         # 修改屏幕尺寸为竖屏模式
         self.settings.settings['screen_size'] = (500, 780)
         self.screen_width, self.screen_height = self.settings.settings['screen_size']
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.display = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("龙了个龙")
+        # 帧分析器（默认关闭）；启用时界面绘制到统计 blit 次数的画布上
+        if profile is None:
+            profile = self.settings.settings.get('profiler', False)
+        self.profiler = FrameProfiler(enabled=profile)
+        self.screen = self.profiler.create_canvas(self.display) if self.profiler.enabled else self.display
         self.clock = pygame.time.Clock()
-        self.assets = Assets()
+        # 图像在后台线程中加载，主菜单先用占位绘制显示出来
+        self.assets = Assets(background_loading=True)
+        self.assets.prioritize(self.SCENE_ASSETS["main_menu"])
         self.current_scene = "main_menu"  # 当前场景
         self.game_logic = None  # 游戏逻辑对象
+        self.board_cache = None  # 棋盘图层合成缓存，每局重新创建
+        self.hover_pos = None  # 最近一次鼠标移动的位置
+        self.hover_dirty = False  # 悬停图案是否需要重新计算
+        self.dirty = DirtyRectTracker((self.screen_width, self.screen_height))  # 需要重绘的屏幕区域
+        self.rendered_scene = None  # 屏幕上当前显示的场景
+        self.shown_seconds = None  # 屏幕上当前显示的倒计时秒数
+        self.mouse_pressed = False  # 鼠标左键是否按下，用于按钮的按下状态
+        self.has_focus = True  # 窗口是否拥有输入焦点
         # 动态调整字体大小
         self.font_size = int(self.screen_height * 0.03)
+        self.fonts = font_registry  # 共享的字体注册表和文字图像缓存
         # 修改字体为支持中文的字体，例如 "SimHei"
-        self.font = pygame.font.SysFont("SimHei", self.font_size, bold=True)  # 加粗字体
+        self.font = self.fonts.get_font("SimHei", self.font_size, bold=True)  # 加粗字体
         self.scoreboard = Scoreboard()
         self.level_manager = LevelManager()
         self.network_manager = NetworkManager("https://example.com/api")  # 示例服务器地址
@@ -133,16 +179,7 @@ class UIManager:
         )
 
         # 游戏界面道具按钮（使用图标按钮）
-        self.hint_icon = self.assets.get_image("hint_icon.png")
-        if self.hint_icon:
-            self.hint_icon = pygame.transform.scale(self.hint_icon, self.small_button_size)
-        else:
-            # 如果没有提示图标，使用带有文字的矩形按钮
-            self.hint_icon = pygame.Surface(self.small_button_size)
-            self.hint_icon.fill((173, 216, 230))
-            hint_text = self.font.render("提", True, (255, 255, 255))
-            hint_rect = hint_text.get_rect(center=(self.small_button_size[0] / 2, self.small_button_size[1] / 2))
-            self.hint_icon.blit(hint_text, hint_rect)
+        self.hint_icon = self.create_item_icon("hint_icon", "提")
 
         self.hint_button = Button(
             screen=self.screen,
@@ -152,16 +189,7 @@ class UIManager:
             shape='rect'  # 根据您的 Button 类，这里仍然是 'rect'，如果需要不同形状可以调整
         )
 
-        self.undo_icon = self.assets.get_image("undo_icon.png")
-        if self.undo_icon:
-            self.undo_icon = pygame.transform.scale(self.undo_icon, self.small_button_size)
-        else:
-            # 如果没有撤销图标，使用带有文字的矩形按钮
-            self.undo_icon = pygame.Surface(self.small_button_size)
-            self.undo_icon.fill((173, 216, 230))
-            undo_text = self.font.render("撤", True, (255, 255, 255))
-            undo_rect = undo_text.get_rect(center=(self.small_button_size[0] / 2, self.small_button_size[1] / 2))
-            self.undo_icon.blit(undo_text, undo_rect)
+        self.undo_icon = self.create_item_icon("undo_icon", "撤")
 
         self.undo_button = Button(
             screen=self.screen,
@@ -197,16 +225,138 @@ class UIManager:
 
         self.selected_mode = None  # 记录玩家选择的模式
 
+        # 排行榜面板：数据版本变化时才重新绘制，记录列表显示在返回按钮上方，可以滚动
+        self.leaderboard_manager = LeaderboardManager()  # 与每局游戏共享，游戏结束后面板自动更新
+        self.leaderboard_panel = LeaderboardPanel(
+            (self.screen_width, self.screen_height),
+            self.leaderboard_manager,
+            background=self.assets.get_scaled_background_image(
+                "game_background", (self.screen_width, self.screen_height)
+            ),
+            bg_color=self.settings.settings['bg_color'],
+            bottom=self.main_menu_button.rect.top - self.spacing
+        )
+
+        if self.profiler.enabled:
+            self.profiler.instrument_transforms()
+            self.profiler.track('scaled_cache_misses', lambda: self.assets.cache_misses)
+            self.profiler.track('text_renders', lambda: self.fonts.cache_misses)
+            self.profiler.track('tile_blits', lambda: self.board_cache.tile_blits if self.board_cache else 0)
+            self.profiler.track('board_repairs', lambda: self.board_cache.repairs if self.board_cache else 0)
+
+    def create_item_icon(self, name, label):
+        """
+        创建道具按钮的图标。图标只从资源清单中查找（assets/items/<名称>.png），
+        清单中没有时直接使用带文字的矩形，不在启动时探测不存在的文件。
+
+        :param name: str，资源名称
+        :param label: str，没有图标时显示的文字
+        :return: pygame.Surface
+        """
+        key = ('item', name)
+        if key in self.assets.manifest:
+            self.assets.ensure_loaded([key])  # 按钮会预渲染各状态，需要立即拿到图像
+            image = self.assets.get_category_images('item').get(name)
+            if image:
+                return pygame.transform.scale(image, self.small_button_size)
+        icon = pygame.Surface(self.small_button_size)
+        icon.fill((173, 216, 230))
+        text = self.fonts.render(self.font, label, (255, 255, 255))
+        icon.blit(text, text.get_rect(center=(self.small_button_size[0] / 2, self.small_button_size[1] / 2)))
+        return icon
+
     def run(self):
         """
         运行界面主循环。
         """
         while True:
+            # 帧率上限；空闲时再阻塞等待输入或下一次需要重绘的时刻
             self.clock.tick(self.settings.settings['fps'])
-            self.handle_events()
-            self.update()
-            self.render()
-            pygame.display.flip()
+            events = self.wait_for_events(self.get_idle_timeout())
+            self.profiler.begin_frame()
+            with self.profiler.phase('events'):
+                self.handle_events(events)
+            with self.profiler.phase('update'):
+                self.update()
+            self.present()
+            self.profiler.end_frame()
+
+    def get_idle_timeout(self):
+        """
+        计算本帧可以阻塞等待的时间。
+
+        :return: int，毫秒；有内容需要立即重绘时返回 None
+        """
+        if self.dirty.has_dirty() or self.hover_dirty or self.current_scene != self.rendered_scene:
+            return None
+        if not self.has_focus:
+            return self.UNFOCUSED_TIMEOUT_MS
+        if self.current_scene == "game":
+            # 等到倒计时显示的秒数变化时再醒来
+            remaining = self.game_logic.timer.remaining_time
+            return int((remaining - int(remaining)) * 1000) + 1 if remaining > 0 else 1
+        return self.IDLE_TIMEOUT_MS
+
+    def wait_for_events(self, timeout):
+        """
+        获取待处理的事件；给出超时时间时先阻塞等待第一个事件。
+
+        :param timeout: int，毫秒；为 None 时不等待
+        :return: list，事件
+        """
+        events = []
+        if timeout is not None:
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        events.extend(pygame.event.get())
+        return events
+
+    def present(self):
+        """
+        只重绘发生变化的区域，并用 pygame.display.update 提交这些区域。
+        切换场景时整屏重绘；画面没有变化的帧不绘制任何内容。
+        """
+        if self.current_scene != self.rendered_scene:
+            self.rendered_scene = self.current_scene
+            self.assets.prioritize(self.SCENE_ASSETS.get(self.current_scene, ()))
+            self.update_button_states(pygame.mouse.get_pos())
+            self.dirty.invalidate_all()
+        if self.current_scene == "game":
+            # 倒计时每秒只重绘一次
+            seconds = int(self.game_logic.timer.remaining_time)
+            if seconds != self.shown_seconds:
+                self.shown_seconds = seconds
+                self.dirty.invalidate(self.get_scoreboard_rect())
+        if self.profiler.overlay_visible:
+            self.dirty.invalidate(self.profiler.overlay_rect)  # 统计数值每帧变化
+        if not self.dirty.has_dirty():
+            return
+
+        full, rects = self.dirty.take()
+        with self.profiler.phase('render:' + self.current_scene):
+            if full:
+                self.render()
+            else:
+                # 各区域分别裁剪重绘，场景只绘制与当前区域相交的部分；
+                # 不用并集裁剪，因为相距较远的区域（例如倒计时和悬停图案）的并集会覆盖大半个棋盘
+                for rect in rects:
+                    self.screen.set_clip(rect)
+                    self.render()
+                self.screen.set_clip(None)
+        if self.profiler.overlay_visible:
+            self.profiler.draw_overlay(self.screen)
+        with self.profiler.phase('display'):
+            if self.screen is not self.display:
+                for rect in ([self.screen.get_rect()] if full else rects):
+                    self.display.blit(self.screen, rect, rect)
+            if full:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.startup_started) * 1000
+            self.report_startup()
 
     def handle_events(self):
         """
@@ -251,9 +401,14 @@ class UIManager:
             # 检查道具按钮
             if self.hint_button.is_clicked(pos):
                 self.game_logic.use_hint()
+                self.dirty.invalidate_all()
             elif self.undo_button.is_clicked(pos):
                 self.game_logic.use_undo()
+                self.dirty.invalidate_all()
             else:
+                # 点击后提示高亮会被清除，需要重绘原来的提示图案
+                for pattern in self.game_logic.hint_patterns:
+                    self.dirty.invalidate(self.get_tile_rect(pattern))
                 self.game_logic.handle_player_action(pos)
         elif self.current_scene == "game_over":
             if self.restart_button.is_clicked(pos):
@@ -267,8 +422,36 @@ class UIManager:
         """
         level_config = self.level_manager.get_level_config(self.selected_mode)
         if level_config:
+            # 释放上一局被分析器包装的对象，避免整个会话一直引用旧的棋盘和合成图
+            self.profiler.release(self.game_logic, self.board_cache)
+            # 棋盘合成缓存会保存图案图像，开始前补齐还没有加载完的资源
+            self.assets.ensure_loaded(self.SCENE_ASSETS["game"])
             # 初始化 GameLogic 对象
-            self.game_logic = GameLogic(level_config, self.screen_width, self.screen_height)
+            self.game_logic = GameLogic(level_config, self.screen_width, self.screen_height,
+                                        leaderboard_manager=self.leaderboard_manager)
+            # 棋盘变化后鼠标下方的图案可能改变，即使鼠标没有移动也要重新计算悬停
+            self.game_logic.events.subscribe(TILE_CLEARED, self.invalidate_hover)
+            self.game_logic.events.subscribe(TILE_RESTORED, self.invalidate_hover)
+            self.game_logic.events.subscribe(TILE_CLEARED, self.invalidate_tile)
+            self.game_logic.events.subscribe(TILE_RESTORED, self.invalidate_tile)
+            self.game_logic.events.subscribe(MATCH, self.invalidate_storage)
+            # 背景和未消除的图案预先合成，图案变化时只重建受影响的层段；被完全遮挡的图案不绘制
+            self.board_cache = LayerCompositeCache(
+                self.game_logic.patterns,
+                (self.screen_width, self.screen_height),
+                self.assets,
+                background=self.assets.get_scaled_background_image(
+                    "game_background", (self.screen_width, self.screen_height)
+                ),
+                bg_color=self.settings.settings['bg_color'],
+                cull_hidden=True,
+                depth_indicator=self.settings.settings.get('stack_depth_indicator', False)
+            )
+            self.game_logic.events.subscribe(TILE_CLEARED, self.board_cache.invalidate)
+            self.game_logic.events.subscribe(TILE_RESTORED, self.board_cache.invalidate)
+            if self.profiler.enabled:
+                self.profiler.instrument(self.game_logic, 'get_pattern_at_position')
+                self.profiler.instrument(self.board_cache, 'draw', 'board_cache.draw')
             self.current_scene = "game"
         else:
             print("无法获取关卡配置！")
@@ -287,19 +470,47 @@ class UIManager:
         print("打开排行榜界面")
 
     def update(self):
+        self.poll_assets()
         if self.current_scene == "game":
             self.game_logic.update()
             if self.game_logic.is_game_over:
                 self.current_scene = "game_over"
                 self.is_victory = self.game_logic.is_victory
 
-                # 在游戏结束时调用 end_game 方法
-                self.game_logic.end_game(player_name="Player1")
+                # 排行榜记录由 GameLogic 的 game_over 事件完成，这里只处理界面相关的收尾
+                # 保存本局回放，用于复现问题和基准测试
+                self.game_logic.save_replay()
 
                 # 上传玩家得分到服务器
                 self.upload_player_score()
 
 
+    def poll_assets(self):
+        """
+        转换后台加载完成的图像，有新图像时整屏重绘以替换占位绘制。
+        """
+        loaded = self.assets.poll()
+        if not loaded:
+            return
+        if ('background', 'game_background') in loaded:
+            self.leaderboard_panel.set_background(self.assets.get_scaled_background_image(
+                "game_background", (self.screen_width, self.screen_height)
+            ))
+        self.dirty.invalidate_all()
+        self.report_startup()
+
+    def report_startup(self):
+        """
+        首帧已显示且资源全部加载完成后，输出一次启动耗时报告。
+        """
+        if self.startup_reported or self.first_frame_ms is None or self.assets.is_loading():
+            return
+        self.startup_reported = True
+        stats = self.assets.get_load_stats()
+        self.startup_report = dict(stats, first_frame_ms=round(self.first_frame_ms, 1))
+        print(f"启动耗时：首帧 {self.first_frame_ms:.0f} 毫秒，资源加载完成 {stats['elapsed_ms']:.0f} 毫秒"
+              f"（{stats['files']} 个文件，解码 {stats['decode_ms']:.0f} 毫秒，转换 {stats['convert_ms']:.0f} 毫秒）")
+
     def render(self):
         """
         渲染当前场景。
@@ -319,25 +530,24 @@ class UIManager:
         """
         渲染主菜单界面。
         """
-        background = self.assets.get_background_image("menu_background")
+        background = self.assets.get_scaled_background_image(
+            "menu_background", (self.screen_width, self.screen_height)
+        )
         if background:
-            # 调整背景图像大小以适应屏幕
-            background = pygame.transform.scale(background, (self.screen_width, self.screen_height))
             self.screen.blit(background, (0, 0))
         else:
             self.screen.fill(self.settings.settings['bg_color'])
 
         # 绘制游戏Logo
-        game_logo = self.assets.get_logo_image("game_logo")
+        logo_size = (int(self.screen_width * 0.7), int(self.screen_height * 0.25))  # 增大 Logo 尺寸
+        game_logo = self.assets.get_scaled_logo_image("game_logo", logo_size)
         if game_logo:
-            logo_size = (int(self.screen_width * 0.7), int(self.screen_height * 0.25))  # 增大 Logo 尺寸
-            game_logo = pygame.transform.scale(game_logo, logo_size)
             logo_rect = game_logo.get_rect(center=(self.screen_width / 2, self.screen_height * 0.2))
             self.screen.blit(game_logo, logo_rect)
         else:
             # 如果没有Logo图片，使用文字标题
-            title_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.1), bold=True)
-            title_text = title_font.render("羊了个羊", True, (255, 255, 255))
+            title_font = self.fonts.get_font("SimHei", int(self.screen_height * 0.1), bold=True)
+            title_text = self.fonts.render(title_font, "羊了个羊", (255, 255, 255))
             title_rect = title_text.get_rect(center=(self.screen_width / 2, self.screen_height * 0.2))
             self.screen.blit(title_text, title_rect)
 
@@ -351,17 +561,17 @@ class UIManager:
         渲染模式选择界面，使用游戏背景。
         """
         # 使用游戏背景
-        background = self.assets.get_background_image("game_background")
+        background = self.assets.get_scaled_background_image(
+            "game_background", (self.screen_width, self.screen_height)
+        )
         if background:
-            # 调整背景图像大小以适应屏幕
-            background = pygame.transform.scale(background, (self.screen_width, self.screen_height))
             self.screen.blit(background, (0, 0))
         else:
             self.screen.fill(self.settings.settings['bg_color'])
 
         # 绘制模式选择标题
-        title_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.06), bold=True)
-        title_text = title_font.render("请选择游戏模式", True, (255, 255, 255))
+        title_font = self.fonts.get_font("SimHei", int(self.screen_height * 0.06), bold=True)
+        title_text = self.fonts.render(title_font, "请选择游戏模式", (255, 255, 255))
         title_rect = title_text.get_rect(center=(self.screen_width / 2, self.screen_height * 0.25))
         self.screen.blit(title_text, title_rect)
 
@@ -371,52 +581,39 @@ class UIManager:
 
     def render_game(self):
         """
-        渲染游戏界面。
+        渲染游戏界面。局部重绘时只绘制与裁剪区域相交的部分。
         """
-        background = self.assets.get_background_image("game_background")
-        if background:
-            background = pygame.transform.scale(background, (self.screen_width, self.screen_height))
-            self.screen.blit(background, (0, 0))
-        else:
-            self.screen.fill(self.settings.settings['bg_color'])
+        clip = self.screen.get_clip()
+        # 绘制背景和游戏图案（预先合成，局部重绘时由裁剪区域限制）
+        self.board_cache.draw(self.screen)
 
-        # 绘制游戏图案
-        for pattern in sorted(self.game_logic.patterns, key=lambda p: p.layer):
+        # 提示列表中的图案和鼠标悬停的图案绘制红色边框；它们都未被覆盖，边框画在最上面
+        highlighted = set(self.game_logic.hint_patterns)
+        if self.game_logic.hovered_pattern is not None:
+            highlighted.add(self.game_logic.hovered_pattern)
+        for pattern in highlighted:
             if not pattern.is_cleared:
-                pattern_image = self.assets.get_pattern_image(pattern.id)
                 x, y = pattern.position
-                if pattern_image:
-                    pattern_image = pygame.transform.scale(pattern_image, pattern.size)
-                    pattern_rect = pattern_image.get_rect(center=(x, y))
-                    self.screen.blit(pattern_image, pattern_rect)
-                else:
-                    pygame.draw.rect(
-                        self.screen,
-                        (255, 255, 255),
-                        pygame.Rect(x - pattern.size[0] / 2, y - pattern.size[1] / 2, *pattern.size)
-                    )
-
-                # 如果该图案在提示列表中，或者鼠标悬停在图案上，绘制红色边框
-                if pattern in self.game_logic.hint_patterns or pattern == self.game_logic.hovered_pattern:
-                    pygame.draw.rect(
-                        self.screen,
-                        (255, 0, 0),
-                        pygame.Rect(x - pattern.size[0] / 2, y - pattern.size[1] / 2, *pattern.size),
-                        3  # 边框宽度
-                    )
+                rect = pygame.Rect(x - pattern.size[0] / 2, y - pattern.size[1] / 2, *pattern.size)
+                if clip.colliderect(rect):
+                    pygame.draw.rect(self.screen, (255, 0, 0), rect, 3)  # 边框宽度 3
 
         # 绘制玩家暂存区
-        self.render_player_storage()
+        if clip.colliderect(self.get_storage_rect()):
+            self.render_player_storage()
 
         # 绘制道具按钮
-        self.hint_button.draw()
-        self.undo_button.draw()
+        for button in (self.hint_button, self.undo_button):
+            if clip.colliderect(button.bounds):
+                button.draw()
 
         # 绘制计分板和倒计时
-        self.render_scoreboard()
+        if clip.colliderect(self.get_scoreboard_rect()):
+            self.render_scoreboard()
 
         # 绘制道具剩余次数
-        self.render_item_counts()
+        if clip.colliderect(self.get_item_counts_rect()):
+            self.render_item_counts()
 
     def render_item_counts(self):
         """
@@ -426,8 +623,8 @@ class UIManager:
         undo_count_str = f"撤销剩余: {self.game_logic.item_manager.undo_limit - self.game_logic.item_manager.undo_used}"
 
         # 渲染文本
-        hint_count_text = self.font.render(hint_count_str, True, (255, 255, 255))
-        undo_count_text = self.font.render(undo_count_str, True, (255, 255, 255))
+        hint_count_text = self.fonts.render(self.font, hint_count_str, (255, 255, 255))
+        undo_count_text = self.fonts.render(self.font, undo_count_str, (255, 255, 255))
 
         # 获取文本矩形
         hint_text_rect = hint_count_text.get_rect(
@@ -444,19 +641,15 @@ class UIManager:
         绘制玩家的暂存区，在界面底部 Undo 和 Hint 按钮上方显示已选中的图案。
         """
         max_storage = self.game_logic.player.storage_limit  # 获取暂存区容量限制
-        item_size = int((self.screen_width - self.spacing * (max_storage + 1)) / max_storage)  # 计算物品尺寸
-
-        y = self.undo_button.position[1] - self.small_button_size[1] / 2 - self.spacing - item_size / 2
-
-        x_start = self.spacing + item_size / 2
+        item_size, x_start, y = self.get_storage_layout()
 
         x = x_start
+        selected_patterns = self.game_logic.player.selected_patterns  # 按分组展开，相同图案相邻
         for i in range(max_storage):
-            if i < len(self.game_logic.player.selected_patterns):
-                pattern = self.game_logic.player.selected_patterns[i]
-                pattern_image = self.assets.get_pattern_image(pattern.id)
+            if i < len(selected_patterns):
+                pattern = selected_patterns[i]
+                pattern_image = self.assets.get_scaled_pattern_image(pattern.id, (item_size, item_size))
                 if pattern_image:
-                    pattern_image = pygame.transform.scale(pattern_image, (item_size, item_size))
                     pattern_rect = pattern_image.get_rect(center=(x, y))
                     self.screen.blit(pattern_image, pattern_rect)
                 else:
@@ -475,39 +668,102 @@ class UIManager:
                 )
             x += item_size + self.spacing  # 间距
 
+    def get_storage_layout(self):
+        """
+        计算暂存区的布局。
+
+        :return: (物品尺寸, 第一个物品的中心 x, 物品中心 y)
+        """
+        max_storage = self.game_logic.player.storage_limit
+        item_size = int((self.screen_width - self.spacing * (max_storage + 1)) / max_storage)  # 计算物品尺寸
+        y = self.undo_button.position[1] - self.small_button_size[1] / 2 - self.spacing - item_size / 2
+        x_start = self.spacing + item_size / 2
+        return item_size, x_start, y
+
+    def get_storage_rect(self):
+        """
+        获取暂存区所在的屏幕区域。
+
+        :return: pygame.Rect
+        """
+        item_size, _, y = self.get_storage_layout()
+        return pygame.Rect(0, y - item_size / 2 - 2, self.screen_width, item_size + 4)
+
+    def get_scoreboard_rect(self):
+        """
+        获取计分板和倒计时所在的屏幕区域。
+
+        :return: pygame.Rect
+        """
+        return pygame.Rect(0, 0, self.screen_width, self.spacing * 2 + self.font.get_linesize())
+
+    def get_item_counts_rect(self):
+        """
+        获取道具剩余次数所在的屏幕区域。
+
+        :return: pygame.Rect
+        """
+        line_height = self.font.get_linesize()
+        top = self.screen_height - self.spacing * 4 - line_height / 2 - 1
+        return pygame.Rect(0, top, self.screen_width, self.spacing * 2 + line_height + 2)
+
+    def get_tile_rect(self, pattern):
+        """
+        获取图案（含高亮边框）所在的屏幕区域。
+
+        :param pattern: Pattern 对象
+        :return: pygame.Rect
+        """
+        x, y = pattern.position
+        width, height = pattern.size
+        return pygame.Rect(x - width / 2, y - height / 2, width, height).inflate(4, 4)
+
+    def invalidate_tile(self, pattern, **_):
+        """
+        图案被消除或恢复时，重绘该图案、暂存区和计分板。
+        """
+        self.dirty.invalidate(self.get_tile_rect(pattern))
+        self.invalidate_storage()
+
+    def invalidate_storage(self, **_):
+        """
+        暂存区或得分变化时，重绘暂存区和计分板。
+        """
+        self.dirty.invalidate(self.get_storage_rect())
+        self.dirty.invalidate(self.get_scoreboard_rect())
+
     def render_scoreboard(self):
         """
         绘制计分板和倒计时。
         """
-        # 显示得分
+        # 显示得分（文字图像按内容缓存，数值不变时不会重新渲染）
         score_text_str = f"得分: {self.game_logic.player.score}"
-        score_text = self.font.render(score_text_str, True, (255, 255, 255))
+        score_text = self.fonts.render(self.font, score_text_str, (255, 255, 255))
         self.screen.blit(score_text, (self.spacing, self.spacing))
 
         # 显示倒计时
         time_remaining = int(self.game_logic.timer.remaining_time)
         time_text_str = f"时间: {time_remaining}(s)"
-        time_text = self.font.render(time_text_str, True, (255, 255, 255))
-        text_width, text_height = self.font.size(time_text_str)
-        self.screen.blit(time_text, (self.screen_width - text_width - self.spacing, self.spacing))
+        time_text = self.fonts.render(self.font, time_text_str, (255, 255, 255))
+        self.screen.blit(time_text, (self.screen_width - time_text.get_width() - self.spacing, self.spacing))
 
     def render_game_over(self):
         """
         渲染游戏结束界面。
         """
-        background = self.assets.get_background_image("menu_background")
+        background = self.assets.get_scaled_background_image(
+            "menu_background", (self.screen_width, self.screen_height)
+        )
         if background:
-            # 调整背景图像大小以适应屏幕
-            background = pygame.transform.scale(background, (self.screen_width, self.screen_height))
             self.screen.blit(background, (0, 0))
         else:
             self.screen.fill(self.settings.settings['bg_color'])
 
         result_text = "胜利！" if self.is_victory else "游戏结束！"
-        result_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.08), bold=True)
-        result_render = result_font.render(result_text, True, (255, 255, 255))
+        result_font = self.fonts.get_font("SimHei", int(self.screen_height * 0.08), bold=True)
+        result_render = self.fonts.render(result_font, result_text, (255, 255, 255))
 
-        score_render = self.font.render(f"得分: {self.game_logic.player.score}", True, (255, 255, 255))
+        score_render = self.fonts.render(self.font, f"得分: {self.game_logic.player.score}", (255, 255, 255))
 
         # 居中显示结果
         self.screen.blit(result_render, result_render.get_rect(center=(self.screen_width / 2, self.screen_height * 0.3)))
@@ -524,129 +780,125 @@ class UIManager:
         score = self.game_logic.player.score
         self.network_manager.upload_score(player_name, score)
 
-    def handle_events(self):
+    def handle_events(self, events=None):
         """
         处理全局事件。
+        同一帧内的多个鼠标移动事件只记录最后的位置，悬停图案每帧最多计算一次。
+
+        :param events: list，要处理的事件；为 None 时从事件队列中取出
         """
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1:
+                    self.mouse_pressed = True
+                    self.update_button_states(event.pos)
                 self.handle_mouse_click(event.pos)
+            elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 1:
+                    self.mouse_pressed = False
+                    self.update_button_states(event.pos)
             elif event.type == pygame.MOUSEMOTION:
-                # 处理鼠标移动事件，更新悬停的图案
-                self.handle_mouse_hover(event.pos)
+                # 记录鼠标位置，在本帧事件处理完后统一更新悬停的图案
+                self.hover_pos = event.pos
+                self.hover_dirty = True
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.dirty.invalidate_all()
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.has_focus = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.has_focus = True
+            elif event.type == pygame.MOUSEWHEEL and self.current_scene == "leaderboard":
+                self.scroll_leaderboard(-event.y * self.leaderboard_panel.row_height)
+            elif event.type == pygame.KEYDOWN:
+                if self.current_scene == "leaderboard" and event.key in (pygame.K_UP, pygame.K_DOWN):
+                    direction = -1 if event.key == pygame.K_UP else 1
+                    self.scroll_leaderboard(direction * self.leaderboard_panel.row_height)
+                elif self.profiler.enabled:
+                    self.handle_profiler_key(event.key)
+
+        if self.hover_dirty:
+            self.hover_dirty = False
+            self.update_button_states(self.hover_pos)
+            self.handle_mouse_hover(self.hover_pos)
+
+    def scroll_leaderboard(self, pixels):
+        """
+        滚动排行榜记录列表，只重绘列表区域。
+        :param pixels: int，正数向下滚动
+        """
+        if self.leaderboard_panel.scroll_by(pixels):
+            self.dirty.invalidate(self.leaderboard_panel.viewport)
+
+    def handle_profiler_key(self, key):
+        """
+        处理帧分析器的快捷键：F3 显示/隐藏统计浮层，F4 导出 Chrome 追踪文件。
+        :param key: int，按键
+        """
+        if key == pygame.K_F3:
+            self.dirty.invalidate(self.profiler.overlay_rect)
+            self.profiler.toggle_overlay()
+        elif key == pygame.K_F4:
+            path = self.profiler.export_trace()
+            print(f"性能追踪已导出：{path}")
+
+    def get_scene_buttons(self):
+        """
+        获取当前场景中绘制的按钮。
+
+        :return: tuple，Button 对象
+        """
+        return {
+            "main_menu": (self.start_button, self.settings_button, self.rank_button, self.quit_button),
+            "mode_selection": (self.easy_mode_button, self.hard_mode_button, self.hell_mode_button),
+            "game": (self.hint_button, self.undo_button),
+            "game_over": (self.restart_button, self.main_menu_button),
+            "leaderboard": (self.main_menu_button,),
+        }.get(self.current_scene, ())
+
+    def update_button_states(self, pos):
+        """
+        更新当前场景中按钮的悬停和按下状态，状态改变时重绘该按钮。
+        :param pos: (x, y) 鼠标位置
+        """
+        for button in self.get_scene_buttons():
+            if button.update_state(pos, self.mouse_pressed):
+                self.dirty.invalidate(button.bounds)
+
+    def invalidate_hover(self, **_):
+        """
+        标记悬停图案需要在下一帧重新计算。
+        """
+        self.hover_dirty = self.hover_pos is not None
 
     def handle_mouse_hover(self, pos):
         """
-        处理鼠标悬停事件，检查鼠标是否悬停在某个图案上。
+        处理鼠标悬停事件，找到鼠标下方最上层的可选择图案。
         :param pos: (x, y) 鼠标位置
         """
-        if self.game_logic is None:
-            return  # 如果游戏逻辑还未初始化，直接返回
-
-        # 清空之前的悬停高亮状态
-        self.game_logic.hovered_pattern = None
+        if self.game_logic is None or self.current_scene != "game":
+            return  # 如果游戏逻辑还未初始化或不在游戏界面，直接返回
 
-        # 检查是否悬停在某个图案上
-        for pattern in self.game_logic.patterns:
-            if pattern.contains_point(pos) and not pattern.is_cleared:
-                self.game_logic.hovered_pattern = pattern
-                break
+        # 通过空间索引查询鼠标位置上最上层的可选择图案；
+        # 同层的其他图案可能在新位置上盖住当前悬停的图案，因此每次都重新查询
+        hovered = self.game_logic.hovered_pattern
+        pattern = self.game_logic.get_pattern_at_position(pos)
+        if pattern is not hovered:
+            for changed in (hovered, pattern):
+                if changed is not None:
+                    self.dirty.invalidate(self.get_tile_rect(changed))
+            self.game_logic.hovered_pattern = pattern
 
     def render_leaderboard(self):
         """
         渲染排行榜界面。
+        面板图像只在排行榜数据变化时重建，每帧只需两次贴图。
         """
-        # 设置背景为游戏背景
-        background = self.assets.get_background_image("game_background")
-        if background:
-            background = pygame.transform.scale(background, (self.screen_width, self.screen_height))
-            self.screen.blit(background, (0, 0))
-        else:
-            self.screen.fill(self.settings.settings['bg_color'])
-
-        # 添加半透明覆盖层
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  # 黑色半透明
-        self.screen.blit(overlay, (0, 0))
-
-        # 获取排行榜数据
-        leaderboard = self.game_logic.leaderboard_manager.get_leaderboard()
-
-        # 绘制排行榜标题
-        title_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.08), bold=True)
-        title_text = title_font.render("排行榜", True, (255, 215, 0))  # 金色字体
-        title_rect = title_text.get_rect(center=(self.screen_width / 2, self.screen_height * 0.1))
-        self.screen.blit(title_text, title_rect)
-
-        # 绘制表头
-        header_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.04), bold=True)
-        headers = ["排名", "玩家", "分数", "时间(s)"]
-        header_colors = (255, 255, 255)
-        header_positions = [
-            (self.screen_width * 0.15, self.screen_height * 0.2),
-            (self.screen_width * 0.4, self.screen_height * 0.2),
-            (self.screen_width * 0.6, self.screen_height * 0.2),
-            (self.screen_width * 0.85, self.screen_height * 0.2)
-        ]
-
-        for header, pos in zip(headers, header_positions):
-            header_text = header_font.render(header, True, header_colors)
-            header_rect = header_text.get_rect(center=pos)
-            self.screen.blit(header_text, header_rect)
-
-        # 绘制分割线
-        pygame.draw.line(self.screen, (255, 255, 255), (self.screen_width * 0.1, self.screen_height * 0.25),
-                         (self.screen_width * 0.9, self.screen_height * 0.25), 2)
-
-        # 绘制排行榜内容
-        entry_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.035))
-        row_height = int(self.screen_height * 0.07)
-        start_y = self.screen_height * 0.3
-
-        for index, entry in enumerate(leaderboard, start=1):
-            # 计算每一行的Y坐标
-            y = start_y + index * row_height
-
-            # 交替行背景色
-            if index % 2 == 0:
-                row_color = (50, 50, 50, 100)  # 深灰色半透明
-            else:
-                row_color = (80, 80, 80, 100)  # 灰色半透明
-
-            row_rect = pygame.Rect(self.screen_width * 0.1, y - row_height / 2, self.screen_width * 0.8,
-                                   row_height - 10)
-            row_surface = pygame.Surface((row_rect.width, row_rect.height), pygame.SRCALPHA)
-            row_surface.fill(row_color)
-            self.screen.blit(row_surface, (row_rect.x, row_rect.y))
-
-            # 绘制每一列的内容
-            entry_data = [
-                str(index),
-                entry['player'],
-                str(entry['score']),
-                str(int(entry['time']))
-            ]
-            column_positions = [
-                self.screen_width * 0.15,
-                self.screen_width * 0.4,
-                self.screen_width * 0.6,
-                self.screen_width * 0.85
-            ]
-
-            for data, pos in zip(entry_data, column_positions):
-                entry_text = entry_font.render(data, True, (255, 255, 255))
-                entry_rect = entry_text.get_rect(center=(pos, y))
-                self.screen.blit(entry_text, entry_rect)
-
-        # 如果排行榜为空，显示提示信息
-        if not leaderboard:
-            no_data_font = pygame.font.SysFont("SimHei", int(self.screen_height * 0.04), bold=True)
-            no_data_text = no_data_font.render("暂无排行榜数据", True, (255, 255, 255))
-            no_data_rect = no_data_text.get_rect(center=(self.screen_width / 2, self.screen_height * 0.5))
-            self.screen.blit(no_data_text, no_data_rect)
+        self.leaderboard_panel.draw(self.screen)
 
         # 绘制返回主菜单按钮
         self.main_menu_button.draw()
@@ -1,12 +1,16 @@
 # ui/utils.py
 
 import pygame
+from ui.fonts import font_registry
 
 class Button:
     """
     按钮类，创建可点击的文字按钮或图形按钮。
+    普通、悬停、按下三种状态在创建或修改样式时预先绘制成图像，绘制时只需一次 blit。
     """
 
+    STATES = ('normal', 'hover', 'pressed')
+
     def __init__(self, screen, text='', position=(0, 0), size=(40, 40), font_size=24, font_name="Arial",
                  bg_color=(0, 0, 0), text_color=(255, 255, 255), image=None, shape='rect'):
         """
@@ -27,65 +31,139 @@ class Button:
         self.text = text
         self.position = position
         self.size = size
-        self.font = pygame.font.SysFont(font_name, font_size, bold=True)  # 使用指定的字体
+        self.font = font_registry.get_font(font_name, font_size, bold=True)  # 使用指定的字体，所有按钮共享
         self.bg_color = bg_color  # 按钮背景颜色
         self.text_color = text_color  # 按钮文字颜色
         self.image = image  # 按钮背景图片
         self.shape = shape  # 按钮形状
+        self.state = 'normal'  # 当前状态：'normal'、'hover' 或 'pressed'
 
         # 创建按钮的矩形区域
         self.rect = pygame.Rect(0, 0, *self.size)
         self.rect.center = self.position
+        self.build()
 
-    def draw(self):
+    def build(self):
+        """
+        计算按钮的几何信息并预先绘制各状态的图像。
+        """
+        x, y = self.position
+        w, h = self.size
+        # 点击检测使用的几何信息
+        self.radius = w // 2                         # 圆形按钮的半径
+        self.cloud_radius = h // 2                   # 云朵两侧圆的半径
+        self.cloud_centers = ((x - w // 4, y), (x + w // 4, y))
+        self.cloud_body = pygame.Rect(x - w // 4, y - h // 2, w // 2, h)
+
+        self.bounds = self.get_draw_bounds()  # 绘制时实际覆盖的区域，用于局部重绘
+        self.surfaces = {state: self.render_state(state) for state in self.STATES}
+
+    def restyle(self, text=None, bg_color=None, text_color=None, image=None):
+        """
+        修改按钮样式并重新绘制各状态的图像。
+
+        :param text: str，新的文本
+        :param bg_color: tuple，新的背景颜色
+        :param text_color: tuple，新的文字颜色
+        :param image: pygame.Surface，新的背景图片
+        """
+        if text is not None:
+            self.text = text
+        if bg_color is not None:
+            self.bg_color = bg_color
+        if text_color is not None:
+            self.text_color = text_color
+        if image is not None:
+            self.image = image
+        self.build()
+
+    def get_draw_bounds(self):
+        """
+        计算按钮绘制时覆盖的矩形区域（圆形按钮和云朵两侧的圆可能超出按钮矩形）。
+
+        :return: pygame.Rect
+        """
+        bounds = self.rect.copy()
+        if not self.image and self.shape == 'circle':
+            x, y = self.position
+            bounds.union_ip(pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2))
+        elif not self.image and self.shape == 'cloud':
+            radius = self.cloud_radius
+            for cx, cy in self.cloud_centers:
+                bounds.union_ip(pygame.Rect(cx - radius, cy - radius, radius * 2, radius * 2))
+        return bounds.inflate(2, 2)
+
+    def get_state_color(self, state):
         """
-        绘制按钮，包括背景颜色和文字。
+        获取指定状态下的背景颜色：悬停时变亮，按下时变暗。
+
+        :param state: str，按钮状态
+        :return: tuple
+        """
+        if state == 'hover':
+            return tuple(min(255, c + 30) for c in self.bg_color)
+        if state == 'pressed':
+            return tuple(max(0, c - 30) for c in self.bg_color)
+        return self.bg_color
+
+    def render_state(self, state):
+        """
+        把按钮在指定状态下的样子绘制到一张透明图像上。
+
+        :param state: str，按钮状态
+        :return: pygame.Surface，大小与 bounds 相同
         """
-        mouse_pos = pygame.mouse.get_pos()
-        is_hovered = self.is_clicked(mouse_pos)
+        surface = pygame.Surface(self.bounds.size, pygame.SRCALPHA)
+        ox, oy = self.bounds.topleft
+        rect = self.rect.move(-ox, -oy)
 
         if self.image:
-            # 如果有背景图片，直接绘制图片
-            self.screen.blit(self.image, self.rect)
+            # 如果有背景图片，直接绘制图片；按下时稍微变暗
+            surface.blit(self.image, rect)
+            if state == 'pressed':
+                surface.fill((200, 200, 200), rect, special_flags=pygame.BLEND_RGB_MULT)
         else:
-            if self.shape == 'rect':
-                # 根据是否悬停改变背景颜色
-                color = self.bg_color
-                if is_hovered:
-                    color = tuple(min(255, c + 30) for c in self.bg_color)  # 变亮
-                pygame.draw.rect(self.screen, color, self.rect)
-            elif self.shape == 'circle':
+            color = self.get_state_color(state)
+            if self.shape == 'circle':
                 # 绘制圆形按钮
-                color = self.bg_color
-                if is_hovered:
-                    color = tuple(min(255, c + 30) for c in self.bg_color)
-                pygame.draw.circle(self.screen, color, self.position, self.size[0] // 2)
+                pygame.draw.circle(surface, color, (self.position[0] - ox, self.position[1] - oy), self.radius)
             elif self.shape == 'cloud':
-                # 绘制简易云朵形状
-                color = self.bg_color
-                if is_hovered:
-                    color = tuple(min(255, c + 30) for c in self.bg_color)
-                x, y = self.position
-                w, h = self.size
-                radius = h // 2
-                # 左圆
-                pygame.draw.circle(self.screen, color, (x - w // 4, y), radius)
-                # 右圆
-                pygame.draw.circle(self.screen, color, (x + w // 4, y), radius)
-                # 中间矩形
-                pygame.draw.rect(self.screen, color, (x - w // 4, y - h // 2, w // 2, h))
+                # 绘制简易云朵形状：左右两个圆和中间的矩形
+                for cx, cy in self.cloud_centers:
+                    pygame.draw.circle(surface, color, (cx - ox, cy - oy), self.cloud_radius)
+                pygame.draw.rect(surface, color, self.cloud_body.move(-ox, -oy))
             else:
-                # 默认绘制矩形按钮
-                color = self.bg_color
-                if is_hovered:
-                    color = tuple(min(255, c + 30) for c in self.bg_color)
-                pygame.draw.rect(self.screen, color, self.rect)
+                # 矩形按钮（默认）
+                pygame.draw.rect(surface, color, rect)
 
         # 绘制按钮文本
         if self.text:
-            text_surface = self.font.render(self.text, True, self.text_color)
-            text_rect = text_surface.get_rect(center=self.position)
-            self.screen.blit(text_surface, text_rect)
+            text_surface = font_registry.render(self.font, self.text, self.text_color)
+            text_rect = text_surface.get_rect(center=(self.position[0] - ox, self.position[1] - oy))
+            surface.blit(text_surface, text_rect)
+        return surface
+
+    def update_state(self, mouse_pos, pressed=False):
+        """
+        根据鼠标位置和按键状态更新按钮状态。
+
+        :param mouse_pos: (x, y)，鼠标位置
+        :param pressed: bool，鼠标左键是否按下
+        :return: bool，状态是否改变
+        """
+        if self.is_clicked(mouse_pos):
+            state = 'pressed' if pressed else 'hover'
+        else:
+            state = 'normal'
+        changed = state != self.state
+        self.state = state
+        return changed
+
+    def draw(self):
+        """
+        绘制按钮当前状态的预渲染图像。
+        """
+        self.screen.blit(self.surfaces[self.state], self.bounds)
 
     def is_clicked(self, mouse_pos):
         """
@@ -94,14 +172,16 @@ class Button:
         :param mouse_pos: (x, y)，鼠标点击位置
         :return: bool
         """
+        mx, my = mouse_pos
         if self.shape == 'circle':
             # 检查点击是否在圆形按钮内
             x, y = self.position
-            dx = mouse_pos[0] - x
-            dy = mouse_pos[1] - y
-            distance_squared = dx * dx + dy * dy
-            radius = self.size[0] // 2
-            return distance_squared <= radius * radius
-        else:
-            # 检查点击是否在矩形或云朵按钮内
+            return (mx - x) ** 2 + (my - y) ** 2 <= self.radius * self.radius
+        if self.image or self.shape != 'cloud':
+            # 检查点击是否在矩形按钮内
             return self.rect.collidepoint(mouse_pos)
+        # 云朵按钮：检查点击是否在两侧的圆或中间的矩形内
+        if self.cloud_body.collidepoint(mouse_pos):
+            return True
+        radius_squared = self.cloud_radius * self.cloud_radius
+        return any((mx - cx) ** 2 + (my - cy) ** 2 <= radius_squared for cx, cy in self.cloud_centers)